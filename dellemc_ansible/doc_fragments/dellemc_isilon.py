@@ -6,6 +6,9 @@ __metaclass__ = type
 
 
 class ModuleDocFragment(object):
+    # The fragments are plain strings, Ansible only parses them when the
+    # documentation of a module is built by ansible-doc, never while a
+    # module runs on the managed node
 
     DOCUMENTATION = r'''
 options:
@@ -131,6 +131,8 @@ options:
 
 notes:
 - Creation/Deletion of access zone is not allowed through Ansible module.
+- Check mode is supported. The modification flags report the pending
+  changes and the access zone details are returned unmodified.
 '''
 
 EXAMPLES = r'''
@@ -289,14 +291,25 @@ access_zone_details:
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.storage.dell \
     import dellemc_ansible_isilon_utils as utils
 
 LOG = utils.get_logger('dellemc_isilon_accesszone', log_devel=logging.INFO)
-HAS_ISILON_SDK = utils.has_isilon_sdk()
 
-ISILON_SDK_VERSION_CHECK = utils.isilon_sdk_version_check()
+# Characters stripped from the body of an ApiException by determine_error
+ERROR_PATTERN = re.compile('[^A-Za-z:.,]+')
+
+# SMB settings that are reported by the array in decimal but are accepted
+# and returned by this module in octal
+OCTAL_SMB_KEYS = ('directory_create_mask', 'directory_create_mode',
+                  'file_create_mask', 'file_create_mode')
+
+# NFS settings that are modified through the export and zone settings
+NFS_EXPORT_KEYS = ('commit_asynchronous',)
+NFS_ZONE_KEYS = ('nfsv4_domain', 'nfsv4_allow_numeric_ids', 'nfsv4_no_domain',
+                 'nfsv4_no_domain_uids', 'nfsv4_no_names')
 
 
 class IsilonAccessZone(object):
@@ -304,44 +317,53 @@ class IsilonAccessZone(object):
 
     def __init__(self):
         """ Define all parameters required by this module"""
-        self.module_params = utils.get_isilon_management_host_parameters()
-        self.module_params.update(get_isilon_accesszone_parameters())
-
         # initialize the Ansible module
         self.module = AnsibleModule(
-            argument_spec=self.module_params,
-            supports_check_mode=False
+            argument_spec=ARGUMENT_SPEC,
+            supports_check_mode=True
         )
 
-        if HAS_ISILON_SDK is False:
+        # The SDK is only probed once the playbook arguments are valid
+        if utils.has_isilon_sdk() is False:
             self.module.fail_json(msg="Ansible modules for Isilon require the"
                                       " isi_sdk_8_1_1 python library to be "
                                       "installed. Please install the library "
                                       "before using these modules.")
 
-        if ISILON_SDK_VERSION_CHECK and \
-                not ISILON_SDK_VERSION_CHECK['supported_version']:
-            err_msg = ISILON_SDK_VERSION_CHECK['unsupported_version_message']
+        isilon_sdk_version_check = utils.isilon_sdk_version_check()
+        if isilon_sdk_version_check and \
+                not isilon_sdk_version_check['supported_version']:
+            err_msg = isilon_sdk_version_check['unsupported_version_message']
             LOG.error(err_msg)
             self.module.fail_json(msg=err_msg)
 
         self.api_client = utils.get_isilon_connection(self.module.params)
         self.api_instance = utils.isi_sdk.ZonesApi(self.api_client)
         self.api_protocol = utils.isi_sdk.ProtocolsApi(self.api_client)
+        # The zone, NFS and SMB settings are independent of each other, so
+        # they are fetched concurrently on a pool shared by all calls
+        self.executor = ThreadPoolExecutor(max_workers=4)
         LOG.info('Got the isi_sdk instance for authorization on to Isilon')
 
     def get_details(self, name):
         """ Get access zone details"""
         try:
             nfs_settings = {}
-            api_response = self.api_instance.get_zone(name).to_dict()
-            nfs_export_settings = self.api_protocol.get_nfs_settings_export(
-                zone=name).to_dict()
+            zone_future = self.executor.submit(
+                self.api_instance.get_zone, name)
+            nfs_export_future = self.executor.submit(
+                self.api_protocol.get_nfs_settings_export, zone=name)
+            nfs_zone_future = self.executor.submit(
+                self.api_protocol.get_nfs_settings_zone, zone=name)
+            smb_future = self.executor.submit(
+                self.api_protocol.get_smb_settings_share, zone=name)
+
+            api_response = zone_future.result().to_dict()
+            nfs_export_settings = nfs_export_future.result().to_dict()
             nfs_export_settings['export_settings'] = nfs_export_settings[
                 'settings']
             del nfs_export_settings['settings']
-            nfs_zone_settings = self.api_protocol.get_nfs_settings_zone(
-                zone=name).to_dict()
+            nfs_zone_settings = nfs_zone_future.result().to_dict()
             nfs_zone_settings['zone_settings'] = nfs_zone_settings['settings']
             del nfs_zone_settings['settings']
 
@@ -349,20 +371,8 @@ class IsilonAccessZone(object):
             nfs_settings['nfs_settings'].update(nfs_zone_settings)
 
             api_response.update(nfs_settings)
-            smb_settings = self.api_protocol.get_smb_settings_share(
-                zone=name).to_dict()
-            smb_settings['settings']['directory_create_mask(octal)'] = \
-                "{0:o}".format(smb_settings['settings']
-                               ['directory_create_mask'])
-            smb_settings['settings']['directory_create_mode(octal)'] = \
-                "{0:o}".format(smb_settings['settings']
-                               ['directory_create_mode'])
-            smb_settings['settings']['file_create_mask(octal)'] = \
-                "{0:o}".format(smb_settings['settings']
-                               ['file_create_mask'])
-            smb_settings['settings']['file_create_mode(octal)'] = \
-                "{0:o}".format(smb_settings['settings']
-                               ['file_create_mode'])
+            smb_settings = smb_future.result().to_dict()
+            self.set_octal_smb_settings(smb_settings['settings'])
             smb_settings['smb_settings'] = smb_settings['settings']
             del smb_settings['settings']
             api_response.update(smb_settings)
@@ -385,100 +395,103 @@ class IsilonAccessZone(object):
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
-    def is_smb_modification_required(self, smb_playbook, access_zone_details):
-        """ Check if default smb settings of access zone needs to be modified
-        """
-        # Convert octal parameters to decimal for comparison
+    def set_octal_smb_settings(self, smb_settings):
+        """ Add the octal representation of the smb mask and mode bits"""
+        for key in OCTAL_SMB_KEYS:
+            smb_settings[key + '(octal)'] = "{0:o}".format(smb_settings[key])
+
+    def update_smb_details(self, smb, access_zone_details):
+        """ Reflect the modified smb settings in access zone details"""
+        smb_settings = access_zone_details['smb_settings']
+        smb_settings.update(
+            (key, value) for key, value in smb.items() if value is not None)
+        self.set_octal_smb_settings(smb_settings)
+
+    def update_nfs_details(self, nfs, nfs_export_flag, nfs_zone_flag,
+                           access_zone_details):
+        """ Reflect the nfs settings sent to the array by nfs_modify in
+        access zone details"""
+        nfs_settings = access_zone_details['nfs_settings']
+        if nfs_export_flag:
+            nfs_settings['export_settings'].update(
+                (key, nfs[key]) for key in NFS_EXPORT_KEYS if key in nfs)
+        if nfs_zone_flag:
+            nfs_settings['zone_settings'].update(
+                (key, nfs[key]) for key in NFS_ZONE_KEYS if key in nfs)
+
+    def get_decimal_smb_settings(self, smb_playbook):
+        """ Get a copy of the smb settings with the octal parameters
+        converted to decimal"""
+        smb = dict(smb_playbook)
         try:
-            if 'directory_create_mask' in smb_playbook and \
-                    smb_playbook['directory_create_mask'] is not None:
-                smb_playbook['directory_create_mask'] = int(
-                    smb_playbook['directory_create_mask'], 8)
-            if 'directory_create_mode' in smb_playbook and \
-                    smb_playbook['directory_create_mode'] is not None:
-                smb_playbook['directory_create_mode'] = int(
-                    smb_playbook['directory_create_mode'], 8)
-            if 'file_create_mask' in smb_playbook and \
-                    smb_playbook['file_create_mask'] is not None:
-                smb_playbook['file_create_mask'] = int(
-                    smb_playbook['file_create_mask'], 8)
-            if 'file_create_mode' in smb_playbook and \
-                    smb_playbook['file_create_mode'] is not None:
-                smb_playbook['file_create_mode'] = int(
-                    smb_playbook['file_create_mode'], 8)
+            for key in OCTAL_SMB_KEYS:
+                if smb.get(key) is not None:
+                    smb[key] = int(smb[key], 8)
         except Exception as e:
             error_msg = self.determine_error(error_obj=e)
             error_message = 'Conversion from octal to decimal failed with ' \
                             'error: {0}'.format(error_msg)
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
+        return smb
 
-        for key in smb_playbook.keys():
-            if smb_playbook[key] != access_zone_details['smb_settings'][key]:
+    def is_smb_modification_required(self, smb, access_zone_details):
+        """ Check if default smb settings of access zone needs to be modified
+        """
+        smb_settings = access_zone_details['smb_settings']
+        for key, value in smb.items():
+            if value != smb_settings[key]:
                 LOG.info("First Key Modification %s", key)
                 return True
         return False
 
     def smb_modify(self, name, smb):
-        """ Modify smb settings of access zone """
+        """ Modify smb settings of access zone, returns the error message
+        if the modification failed """
         try:
             self.api_protocol.update_smb_settings_share(smb, zone=name)
             LOG.info("Modification Successful")
-            return True
         except Exception as e:
             error_msg = self.determine_error(error_obj=e)
             error_message = 'Modify SMB share settings of access zone {0} ' \
                 'failed with error: {1}'.format(name, error_msg)
             LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
+            return error_message
 
     def is_nfs_modification_required(self, nfs_playbook, access_zone_details):
         """ Check if default nfs settings of access zone needs to be modified
          """
         nfs_export_flag = False
         nfs_zone_flag = False
+        export_settings = access_zone_details['nfs_settings'][
+            'export_settings']
+        zone_settings = access_zone_details['nfs_settings']['zone_settings']
 
-        for key in nfs_playbook.keys():
-            if key in access_zone_details['nfs_settings']['export_settings'].\
-                    keys():
-                if nfs_playbook[key] != access_zone_details['nfs_settings'][
-                        'export_settings'][key]:
-                    LOG.info("First Key Modification %s", key)
-                    nfs_export_flag = True
-
-        for key in nfs_playbook.keys():
-            if key in access_zone_details['nfs_settings']['zone_settings'].\
-                    keys():
-                if nfs_playbook[key] != access_zone_details['nfs_settings'][
-                        'zone_settings'][key]:
-                    LOG.info("First Key Modification %s", key)
-                    nfs_zone_flag = True
+        for key, value in nfs_playbook.items():
+            if key in export_settings and export_settings[key] != value:
+                LOG.info("First Key Modification %s", key)
+                nfs_export_flag = True
+            if key in zone_settings and zone_settings[key] != value:
+                LOG.info("First Key Modification %s", key)
+                nfs_zone_flag = True
+            if nfs_export_flag and nfs_zone_flag:
+                break
 
         return nfs_export_flag, nfs_zone_flag
 
     def nfs_modify(self, name, nfs, nfs_export_flag, nfs_zone_flag):
-        """ Modify nfs settings of access zone """
+        """ Modify nfs settings of access zone, returns the error message
+        if the modification failed """
         nfs_export_dict = {}
         nfs_zone_dict = {}
 
         if nfs_export_flag:
-            if 'commit_asynchronous' in nfs:
-                nfs_export_dict['commit_asynchronous'] = nfs[
-                    'commit_asynchronous']
+            nfs_export_dict = dict((key, nfs[key]) for key in NFS_EXPORT_KEYS
+                                   if key in nfs)
 
         if nfs_zone_flag:
-            if 'nfsv4_domain' in nfs:
-                nfs_zone_dict['nfsv4_domain'] = nfs['nfsv4_domain']
-            if 'nfsv4_allow_numeric_ids' in nfs:
-                nfs_zone_dict['nfsv4_allow_numeric_ids'] = nfs[
-                    'nfsv4_allow_numeric_ids']
-            if 'nfsv4_no_domain' in nfs:
-                nfs_zone_dict['nfsv4_no_domain'] = nfs['nfsv4_no_domain']
-            if 'nfsv4_no_domain_uids' in nfs:
-                nfs_zone_dict['nfsv4_no_domain_uids'] = nfs[
-                    'nfsv4_no_domain_uids']
-            if 'nfsv4_no_names' in nfs:
-                nfs_zone_dict['nfsv4_no_names'] = nfs['nfsv4_no_names']
+            nfs_zone_dict = dict((key, nfs[key]) for key in NFS_ZONE_KEYS
+                                 if key in nfs)
 
         try:
             if nfs_export_flag:
@@ -488,19 +501,37 @@ class IsilonAccessZone(object):
             if nfs_zone_flag:
                 self.api_protocol.update_nfs_settings_zone(nfs_zone_dict,
                                                            zone=name)
-            return True
         except Exception as e:
             error_msg = self.determine_error(error_obj=e)
             error_message = 'Modify NFS export settings of access zone {0} ' \
                             'failed with error: {1}'.format(name, error_msg)
             LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
+            return error_message
+
+    def modify_settings(self, name, smb, nfs, nfs_export_flag,
+                        nfs_zone_flag):
+        """ Modify the smb and nfs settings of access zone. The smb and nfs
+        settings are independent of each other and are modified concurrently
+        """
+        futures = []
+        if smb is not None:
+            futures.append(self.executor.submit(self.smb_modify, name, smb))
+        if nfs_export_flag or nfs_zone_flag:
+            futures.append(self.executor.submit(
+                self.nfs_modify, name, nfs, nfs_export_flag, nfs_zone_flag))
+
+        # fail_json must only be called from the main thread, so the errors
+        # of both modifications are reported together
+        results = [future.result() for future in futures]
+        error_messages = [result for result in results if result is not None]
+        if error_messages:
+            self.module.fail_json(msg=' '.join(error_messages))
 
     def determine_error(self, error_obj):
         """Determine the error message to return"""
         if isinstance(error_obj, utils.ApiException):
             error = error_obj.body
-            error = re.sub('[^A-Za-z:.,]+', ' ', str(error))
+            error = ERROR_PATTERN.sub(' ', str(error))
         else:
             error = error_obj
         return error
@@ -539,28 +570,42 @@ class IsilonAccessZone(object):
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
+        smb_modify_flag = False
+        nfs_export_flag = False
+        nfs_zone_flag = False
+
         if state == 'present' and smb is not None:
+            smb = self.get_decimal_smb_settings(smb)
             smb_modify_flag = self.is_smb_modification_required(
                 smb, access_zone_details)
             LOG.info("SMB modification flag %s", smb_modify_flag)
 
-            if smb_modify_flag:
-                result['smb_modify_flag'] = self.smb_modify(name, smb)
-
         if state == 'present' and nfs is not None:
             nfs_export_flag, nfs_zone_flag = self.\
                 is_nfs_modification_required(nfs, access_zone_details)
             LOG.info("NFS modification flag %s %s", nfs_export_flag,
                      nfs_zone_flag)
 
+        # In check mode the flags report the pending modifications, while
+        # the details are returned as they currently are on the array
+        result['smb_modify_flag'] = smb_modify_flag
+        result['nfs_modify_flag'] = nfs_export_flag or nfs_zone_flag
+        if (smb_modify_flag or nfs_export_flag or nfs_zone_flag) and \
+                not self.module.check_mode:
+            self.modify_settings(name, smb if smb_modify_flag else None, nfs,
+                                 nfs_export_flag, nfs_zone_flag)
+
+            if smb_modify_flag:
+                self.update_smb_details(smb, access_zone_details)
+
             if nfs_export_flag or nfs_zone_flag:
-                result['nfs_modify_flag'] = self.nfs_modify(
-                    name, nfs, nfs_export_flag, nfs_zone_flag)
+                self.update_nfs_details(nfs, nfs_export_flag, nfs_zone_flag,
+                                        access_zone_details)
 
+        # The details are updated in place after a modification, so they do
+        # not need to be fetched again from the array
         result['access_zone_details'] = access_zone_details
         if result['smb_modify_flag'] or result['nfs_modify_flag']:
-            access_zone_details = self.get_details(name)
-            result['access_zone_details'] = access_zone_details
             result['changed'] = True
         self.module.exit_json(**result)
 
@@ -576,6 +621,12 @@ def get_isilon_accesszone_parameters():
     )
 
 
+# Argument spec of the module, the parameters are constant and so the spec
+# is built once when the module is loaded
+ARGUMENT_SPEC = utils.get_isilon_management_host_parameters()
+ARGUMENT_SPEC.update(get_isilon_accesszone_parameters())
+
+
 def main():
     """ Create Isilon access zone object and perform action on it
         based on user input from playbook"""
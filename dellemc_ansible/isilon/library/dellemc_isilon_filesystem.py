@@ -240,10 +240,10 @@ EXAMPLES = r'''
 '''
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.storage.dell \
     import dellemc_ansible_isilon_utils as utils
-import re
 
 RETURN = r'''
 changed:
@@ -326,8 +326,49 @@ filesystem_snapshots:
 
 LOG = utils.get_logger('dellemc_isilon_filesystem',
                        log_devel=logging.INFO)
-HAS_ISILON_SDK = utils.has_isilon_sdk()
-ISILON_SDK_VERSION_CHECK = utils.isilon_sdk_version_check()
+
+# Base paths of the access zones already looked up, keyed by OneFS host and
+# access zone name, so a zone is only fetched once per process
+ZONE_BASE_PATHS = {}
+
+# User and group accounts already looked up, keyed by OneFS host, persona
+# id, access zone and provider
+PERSONAS = {}
+
+# Size parameters of a quota and the threshold each of them sets
+QUOTA_LIMITS = (('advisory_limit_size', 'advisory'),
+                ('hard_limit_size', 'hard'),
+                ('soft_limit_size', 'soft'))
+
+# Number of bytes in each capacity unit of the quota limits
+CAP_UNIT_IN_BYTES = {
+    'MB': utils.MB_IN_BYTES,
+    'GB': utils.GB_IN_BYTES,
+    'TB': utils.TB_IN_BYTES
+}
+
+# Changes of the authoritative type of an ACL, from the one on the array to
+# the one in the playbook, which are not supported
+ACL_CONVERSIONS = frozenset([('acl', 'mode'), ('mode', 'acl')])
+
+# Results of the operations which change the filesystem
+OPERATION_RESULTS = ('create_filesystem', 'delete_filesystem',
+                     'modify_filesystem', 'add_quota', 'delete_quota',
+                     'modify_quota', 'modify_owner', 'modify_group')
+
+# Number of SMB shares listed per request while looking for the shares of a
+# path
+SMB_SHARES_PAGE_SIZE = 1000
+
+# POSIX mode bits of the predefined ACLs, which are set as an ACL instead of
+# mode bits
+ACL_PRESETS = {
+    'private_read': '0550',
+    'private': '0770',
+    'public_read': '0775',
+    'public_read_write': '0777',
+    'public': '0777'
+}
 
 
 class IsilonFileSystem(object):
@@ -345,16 +386,18 @@ class IsilonFileSystem(object):
                                     supports_check_mode=False
                                     )
 
-        if HAS_ISILON_SDK is False:
+        # The SDK is only probed once the playbook arguments are valid
+        if utils.has_isilon_sdk() is False:
             self.module.fail_json(msg='Ansible modules for Isilon '
                                       'require the Isilon python library'
                                       ' to be installed. Please install'
                                       ' the library before using these '
                                       'modules.')
 
-        if ISILON_SDK_VERSION_CHECK and \
-                not ISILON_SDK_VERSION_CHECK['supported_version']:
-            err_msg = ISILON_SDK_VERSION_CHECK['unsupported_version_message']
+        isilon_sdk_version_check = utils.isilon_sdk_version_check()
+        if isilon_sdk_version_check and \
+                not isilon_sdk_version_check['supported_version']:
+            err_msg = isilon_sdk_version_check['unsupported_version_message']
             LOG.error(err_msg)
             self.module.fail_json(msg=err_msg)
 
@@ -368,12 +411,17 @@ class IsilonFileSystem(object):
         self.zone_summary_api = self.isi_sdk.ZonesSummaryApi(self.api_client)
         self.snapshot_api = self.isi_sdk.SnapshotApi(self.api_client)
         self.auth_api = self.isi_sdk.AuthApi(self.api_client)
+        # Runs the requests which do not depend on each other concurrently
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        # ACLs already fetched, keyed by path, until they are modified
+        self.acls = {}
 
     def determine_path(self):
+        params = self.module.params
         path = None
-        if self.module.params['path']:
-            path = self.module.params['path']
-        access_zone = self.module.params['access_zone']
+        if params['path']:
+            path = params['path']
+        access_zone = params['access_zone']
 
         if access_zone.lower() != 'system':
             if path:
@@ -381,20 +429,24 @@ class IsilonFileSystem(object):
 
         # For Filesystem related APIs, the leading '/' is not expected.
         # Hence, we trim it. However, for all other APIs such as exports
-        # this '/' is needed in the beginning of the path and we would
-        # append it to the path wherever needed in this module.
+        # this '/' is needed in the beginning of the path, so both forms
+        # are returned.
         effective_path = path[1:]
 
-        return effective_path
+        return effective_path, path
 
     def get_zone_base_path(self, access_zone):
         """Returns the base path of the Access Zone."""
+        key = (self.module.params['onefs_host'], access_zone)
+        if key in ZONE_BASE_PATHS:
+            return ZONE_BASE_PATHS[key]
         try:
-            zone_path = (self.zone_summary_api.
-                         get_zones_summary_zone(access_zone)).to_dict()
-            return zone_path['summary']['path']
+            zone_summary = self.zone_summary_api.get_zones_summary_zone(
+                access_zone)
+            ZONE_BASE_PATHS[key] = zone_summary.summary.path
+            return ZONE_BASE_PATHS[key]
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Unable to fetch base path of Access Zone {0} ' \
                             'failed with error: {1}'.format(access_zone,
                                                             str(error_msg))
@@ -410,12 +462,10 @@ class IsilonFileSystem(object):
             return resp
         except utils.ApiException as e:
             if str(e.status) == "404":
-                log_msg = "Filesystem {0} status is " \
-                          "{1}".format(path, e.status)
-                LOG.info(log_msg)
+                LOG.info("Filesystem %s status is %s", path, e.status)
                 return None
             else:
-                error_msg = self.determine_error(error_obj=e)
+                error_msg = utils.determine_error(e)
                 error_message = "Failed to get details of Filesystem " \
                                 "{0} with error {1} ".format(
                                     path,
@@ -429,25 +479,33 @@ class IsilonFileSystem(object):
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
-    def get_quota(self, effective_path):
-        """Gets Quota details"""
+    def get_quota(self, path):
+        """Gets Quota details of the absolute path"""
         # On a single path , you can create multiple Quotas of
         # different types (directory, user etc)
         # We are filtering Quotas on the path and the type (directory).
         # On a given path, there can be only One Quota of a given type.
         try:
             filesystem_quota = self.quota_api.list_quota_quotas(
-                path='/' + effective_path,
+                path=path,
                 type='directory')
-            return filesystem_quota.to_dict()
+            return filesystem_quota
         except Exception:
             error_message = 'Unable to get Quota details on ' \
-                            'path {0}'.format(effective_path)
+                            'path {0}'.format(path)
             LOG.info(error_message)
             return None
 
+    def prefetch(self, effective_path, path):
+        """Gets the FileSystem and its Quota details concurrently"""
+        # get_quota never fails the module, so it can run on a worker
+        quota_job = self.executor.submit(self.get_quota, path)
+        filesystem = self.get_filesystem(effective_path)
+        return filesystem, quota_job.result()
+
     def create_filesystem(self, path, recursive, acl, quota, owner, group):
         """Creates a FileSystem on Isilon."""
+        access_zone = self.module.params['access_zone']
         try:
             if not owner:
                 error_message = 'owner is required while creating Filesystem'
@@ -463,10 +521,24 @@ class IsilonFileSystem(object):
             else:
                 owner_provider = 'local'
 
+            # The group is looked up while the owner is, unless it has
+            # already been looked up
+            group_job = None
+            if group and 'name' in group:
+                group_provider = group.get('provider_type', 'local')
+                if (self.module.params['onefs_host'],
+                        'GROUP:' + group['name'], access_zone,
+                        group_provider) not in PERSONAS:
+                    group_job = self.executor.submit(
+                        self.auth_api.get_auth_group,
+                        auth_group_id='GROUP:' + group['name'],
+                        zone=access_zone,
+                        provider=group_provider)
+
             owner_id = self.get_owner_id(
                 name=owner['name'],
-                zone=self.module.params['access_zone'],
-                provider=owner_provider)['users'][0]['uid']['id']
+                zone=access_zone,
+                provider=owner_provider).users[0].uid.id
 
             owner = {'type': 'user', 'id': owner_id,
                      'name': owner['name']}
@@ -484,42 +556,39 @@ class IsilonFileSystem(object):
                 group_id = \
                     self.get_group_id(
                         name=group['name'],
-                        zone=self.module.params['access_zone'],
-                        provider=group_provider)['groups'][0]['gid']['id']
+                        zone=access_zone,
+                        provider=group_provider,
+                        group_job=group_job).groups[0].gid.id
 
                 group = {'type': 'group', 'id': group_id,
                          'name': group['name']}
 
-            info_message = "Attempting to create new FS {0}".format(path)
-            LOG.info(info_message)
+            LOG.info("Attempting to create new FS %s", path)
+            # The SDK sends every header it is given, so the access control
+            # header is only passed when an ACL is provided
+            create_params = dict(x_isi_ifs_target_type='container',
+                                 recursive=recursive,
+                                 overwrite=False)
             if acl is not None:
-                self.namespace_api.create_directory(
-                    path,
-                    x_isi_ifs_target_type='container',
-                    recursive=recursive,
-                    x_isi_ifs_access_control=acl,
-                    overwrite=False)
-            else:
-                self.namespace_api.create_directory(
-                    path,
-                    x_isi_ifs_target_type='container',
-                    recursive=recursive,
-                    overwrite=False)
-            if quota is not None and quota['quota_state'] == 'present':
-                self.create_quota(quota, path)
-
+                create_params['x_isi_ifs_access_control'] = acl
+            self.namespace_api.create_directory(path, **create_params)
+            # The owner and group are set while the Quota is created
             permissions = \
                 self.isi_sdk.NamespaceAcl(
                     authoritative='mode',
                     owner=owner,
                     group=group)
-            self.namespace_api.set_acl(namespace_path=path,
-                                       acl=True,
-                                       namespace_acl=permissions)
+            set_acl_job = self.executor.submit(self.namespace_api.set_acl,
+                                               namespace_path=path,
+                                               acl=True,
+                                               namespace_acl=permissions)
+            if quota is not None and quota['quota_state'] == 'present':
+                self.create_quota(quota, '/' + path)
+            set_acl_job.result()
 
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Creation of Filesystem {0} failed ' \
                             'with error: {1}'.format(path, str(error_msg))
             LOG.error(error_message)
@@ -528,36 +597,62 @@ class IsilonFileSystem(object):
     def delete_filesystem(self, path, access_zone):
         """Deletes a FileSystem on Isilon."""
         try:
+            absolute_path = '/' + path
+            # The NFS exports and SMB shares are listed concurrently
+            smb_share_job = self.executor.submit(
+                self.has_smb_share, absolute_path, access_zone)
+
             # Check for NFS exports
             nfs_exports = self.protocol_api.list_nfs_exports(
-                path='/' + path, zone=access_zone)
+                path=absolute_path, zone=access_zone)
 
-            if nfs_exports.to_dict()['exports']:
+            if nfs_exports.exports:
                 error_message = 'The Filesystem path {0} has NFS ' \
                                 'exports. Hence, deleting this directory ' \
                                 'is not safe'.format(path)
                 LOG.error(error_message)
                 self.module.fail_json(msg=error_message)
             # Check for SMB shares
-            smb_shares = self.protocol_api.list_smb_shares(zone=access_zone)
-            for share in smb_shares.to_dict()['shares']:
-                if share['path'] == '/' + path:
-                    error_message = 'The Filesystem path {0} has SMB ' \
-                                    'Shares. Hence, deleting this directory ' \
-                                    'is not safe'.format(path)
-                    LOG.error(error_message)
-                    self.module.fail_json(msg=error_message)
+            if smb_share_job.result():
+                error_message = 'The Filesystem path {0} has SMB ' \
+                                'Shares. Hence, deleting this directory ' \
+                                'is not safe'.format(path)
+                LOG.error(error_message)
+                self.module.fail_json(msg=error_message)
             self.namespace_api.delete_directory(path)
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Deletion of Filesystem {0} failed ' \
                             'with error: {1}'.format(path, str(error_msg))
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
+    def has_smb_share(self, path, access_zone):
+        """Determines if the absolute path has SMB shares in the access zone.
+        The shares are listed page by page until one is found on the path"""
+        response = self.protocol_api.list_smb_shares(
+            zone=access_zone, limit=SMB_SHARES_PAGE_SIZE)
+        while True:
+            if any(share.path == path for share in response.shares or []):
+                return True
+            if not response.resume:
+                return False
+            # The resume token carries the zone and limit of the first request
+            response = self.protocol_api.list_smb_shares(
+                resume=response.resume)
+
+    def get_acl(self, effective_path):
+        """Gets the ACL of the path, which is only fetched once until it is
+        modified"""
+        if effective_path not in self.acls:
+            self.acls[effective_path] = self.namespace_api.get_acl(
+                effective_path, acl=True).to_dict()
+        return self.acls[effective_path]
+
     def modify_acl(self, path):
         """Modifies Filesystem ACL on Isilon."""
+        self.acls.pop(path, None)
         try:
             acl = self.module.params['access_control']
             new_mode = self.isi_sdk.NamespaceAcl(
@@ -568,108 +663,94 @@ class IsilonFileSystem(object):
                                        namespace_acl=new_mode)
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Modification of ACL on path {0} failed ' \
                             'with error: {1}'.format(path, str(error_msg))
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
+    def get_quota_fields(self, quota, unset_flag):
+        """Returns the Quota fields shared by the create and update params,
+        the flags not given in the playbook are set to unset_flag"""
+        unit_bytes = get_cap_unit_bytes(quota)
+
+        thresholds = {}
+        for limit, threshold in QUOTA_LIMITS:
+            size = quota.get(limit)
+            if size is not None:
+                size = max(size, 0) * unit_bytes
+            thresholds[threshold] = size
+        # The default grace period of the soft limit is 7 days
+        if thresholds['soft'] is not None:
+            thresholds['soft_grace'] = 604800
+        else:
+            thresholds['soft_grace'] = None
+
+        # Only an advisory limit leaves the Quota unenforced
+        enforced = thresholds['hard'] is not None or \
+            thresholds['soft'] is not None
+
+        fields = dict(
+            enforced=enforced,
+            include_snapshots=unset_flag,
+            thresholds_include_overhead=unset_flag,
+            thresholds=self.isi_sdk.QuotaQuotaThresholds(**thresholds))
+        for flag, field in (('include_snap_data', 'include_snapshots'),
+                            ('include_data_protection_overhead',
+                             'thresholds_include_overhead')):
+            value = quota.get(flag)
+            if value is not None:
+                fields[field] = value
+        return fields
+
     def get_quota_update_param(self, quota):
         """Returns the update params for Quota"""
         try:
-            if quota is not None and quota['quota_state'] == 'present':
-                if 'cap_unit' in quota and quota['cap_unit'] is not None:
-                    cap_unit = quota['cap_unit']
-                else:
-                    cap_unit = 'GB'
-
-                enforced = False
-                if 'advisory_limit_size' in quota and \
-                        quota['advisory_limit_size'] is not None:
-                    advisory_limit = utils.get_size_bytes(
-                        quota['advisory_limit_size'], cap_unit)
-                else:
-                    advisory_limit = None
-
-                if 'hard_limit_size' in quota and \
-                        quota['hard_limit_size'] is not None:
-                    hard_limit = utils.get_size_bytes(quota['hard_limit_size'],
-                                                      cap_unit)
-                    enforced = True
-                else:
-                    hard_limit = None
-
-                if 'soft_limit_size' in quota and \
-                        quota['soft_limit_size'] is not None:
-                    soft_limit = utils.get_size_bytes(quota['soft_limit_size'],
-                                                      cap_unit)
-                    enforced = True
-                    soft_grace = 604800
-                else:
-                    soft_limit = None
-                    soft_grace = None
-
-                if 'include_snap_data' in quota and \
-                        quota['include_snap_data'] is not None:
-                    include_snap_data = quota['include_snap_data']
-                else:
-                    include_snap_data = None
-
-                if 'include_data_protection_overhead' in quota and \
-                        quota['include_data_protection_overhead'] is not None:
-                    include_dp_overhead = \
-                        quota['include_data_protection_overhead']
-                else:
-                    include_dp_overhead = None
-
-                threshold = self.isi_sdk.QuotaQuotaThresholds(
-                    advisory=advisory_limit,
-                    hard=hard_limit,
-                    soft=soft_limit,
-                    soft_grace=soft_grace
-                )
-
-                quota_update_param = self.isi_sdk.QuotaQuota(
-                    enforced=enforced,
-                    thresholds_include_overhead=include_dp_overhead,
-                    thresholds=threshold)
-
-            return quota_update_param
+            if quota is None or quota['quota_state'] != 'present':
+                return None
+            fields = self.get_quota_fields(quota, None)
+            # Snapshots can only be included while creating the Quota
+            del fields['include_snapshots']
+            return self.isi_sdk.QuotaQuota(**fields)
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Creation of Quota update param failed ' \
                             'with error: {0}'.format(str(error_msg))
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
-    def modify_quota(self, quota, path):
-        """Modifies Filesystem Quota on Isilon"""
+    def modify_quota(self, quota, path, existing_quota=None):
+        """Modifies Filesystem Quota of the absolute path on Isilon,
+        existing_quota is the Quota already fetched from the array if any"""
         try:
             LOG.info('Modifying Quota..')
-            get_quotas = self.quota_api.list_quota_quotas(path='/' + path,
-                                                          type='directory')
-            quota_id = get_quotas.quotas[0].id
+            if existing_quota:
+                quota_id = existing_quota.quotas[0].id
+            else:
+                get_quotas = self.quota_api.list_quota_quotas(
+                    path=path, type='directory')
+                quota_id = get_quotas.quotas[0].id
             updated_quota = self.get_quota_update_param(quota)
             self.quota_api.update_quota_quota(
                 quota_quota=updated_quota,
                 quota_quota_id=quota_id)
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Modification of Quota on path {0} failed ' \
                             'with error: {1}'.format(path, str(error_msg))
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
     def delete_quota(self, path):
-        """Deletes Filesystem Quota on Isilon"""
+        """Deletes Filesystem Quota of the absolute path on Isilon"""
         try:
             self.quota_api.delete_quota_quotas(
-                path='/' + path,
+                path=path,
                 type='directory')
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Deletion of Quota on path {0} failed ' \
                             'with error: {1}'.format(path, str(error_msg))
             LOG.error(error_message)
@@ -678,83 +759,27 @@ class IsilonFileSystem(object):
     def get_quota_param(self, quota, path):
         """Returns the object needed to create Quota"""
         try:
-            if quota is not None and quota['quota_state'] == 'present':
-                if 'cap_unit' in quota and quota['cap_unit'] is not None:
-                    cap_unit = quota['cap_unit']
-                else:
-                    cap_unit = 'GB'
-
-                enforced = False
-                if 'advisory_limit_size' in quota and \
-                        quota['advisory_limit_size'] is not None:
-                    advisory_limit = utils.get_size_bytes(
-                        quota['advisory_limit_size'], cap_unit)
-                else:
-                    advisory_limit = None
-
-                if 'hard_limit_size' in quota and \
-                        quota['hard_limit_size'] is not None:
-                    hard_limit = utils.get_size_bytes(quota['hard_limit_size'],
-                                                      cap_unit)
-                    enforced = True
-                else:
-                    hard_limit = None
-
-                if 'soft_limit_size' in quota and \
-                        quota['soft_limit_size'] is not None:
-                    soft_limit = utils.get_size_bytes(quota['soft_limit_size'],
-                                                      cap_unit)
-                    enforced = True
-                    soft_grace = 604800
-                else:
-                    soft_limit = None
-                    soft_grace = None
-
-                if 'include_snap_data' in quota and \
-                        quota['include_snap_data'] is not None:
-                    include_snap_data = quota['include_snap_data']
-                else:
-                    include_snap_data = False
-
-                if 'include_data_protection_overhead' in quota and \
-                        quota['include_data_protection_overhead'] is not None:
-                    include_dp_overhead = \
-                        quota['include_data_protection_overhead']
-                else:
-                    include_dp_overhead = False
-
-                threshold = self.isi_sdk.QuotaQuotaThresholds(
-                    advisory=advisory_limit,
-                    hard=hard_limit,
-                    soft=soft_limit,
-                    soft_grace=soft_grace
-                )
-
-                quota_param = self.isi_sdk.QuotaQuotaCreateParams(
-                    enforced=enforced,
-                    include_snapshots=include_snap_data,
-                    thresholds_include_overhead=include_dp_overhead,
-                    path=path,
-                    thresholds=threshold,
-                    type="directory")
-
-            return quota_param
+            if quota is None or quota['quota_state'] != 'present':
+                return None
+            return self.isi_sdk.QuotaQuotaCreateParams(
+                path=path, type="directory",
+                **self.get_quota_fields(quota, False))
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Creation of Quota param failed ' \
                             'with error: {0}'.format(str(error_msg))
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
     def create_quota(self, quota, path):
-        """Creates a Quota"""
+        """Creates a Quota on the absolute path"""
         try:
-            quota_param = self.get_quota_param(quota, '/' + path)
+            quota_param = self.get_quota_param(quota, path)
             self.quota_api.create_quota_quota(
                 quota_quota=quota_param)
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Creation of Quota {0} failed ' \
                             'with error: {1}'.format(path, str(error_msg))
             LOG.error(error_message)
@@ -764,66 +789,35 @@ class IsilonFileSystem(object):
         """Determines if ACLs are modified."""
         try:
             LOG.info('Determining if the ACLs are modified..')
-            if self.module.params['access_control']:
-                if self.module.params['access_control'] == 'private_read':
-                    acl_posix = '0550'
-                    new_authoritative = 'acl'
-                elif self.module.params['access_control'] == 'private':
-                    acl_posix = '0770'
-                    new_authoritative = 'acl'
-                elif self.module.params['access_control'] == 'public_read':
-                    acl_posix = '0775'
-                    new_authoritative = 'acl'
-                elif self.module.params['access_control'] == \
-                        'public_read_write':
-                    acl_posix = '0777'
-                    new_authoritative = 'acl'
-                elif self.module.params['access_control'] == 'public':
-                    acl_posix = '0777'
+            access_control = self.module.params['access_control']
+            if access_control:
+                if access_control in ACL_PRESETS:
+                    acl_posix = ACL_PRESETS[access_control]
                     new_authoritative = 'acl'
                 else:
-                    acl_posix = self.module.params['access_control']
+                    acl_posix = access_control
                     new_authoritative = 'mode'
 
-                filesystem_acl = \
-                    (self.namespace_api.get_acl(effective_path,
-                                                acl=True)).to_dict()
-                info_message = 'ACL of the filesystem on ' \
-                               'the array is {0}'.format(filesystem_acl)
-                LOG.info(info_message)
-                info_message = 'ACL provided in the ' \
-                               'playbook is {0}'.format(acl_posix)
-                LOG.info(info_message)
-
-                if filesystem_acl['authoritative'] == 'acl' \
-                        and new_authoritative == 'mode':
-                    error_message = 'Modification of ACL from Ansible ' \
-                                    'modules is only supported from ' \
-                                    'POSIX to POSIX mode bits.'
-                    LOG.error(error_message)
-                    self.module.fail_json(msg=error_message)
+                filesystem_acl = self.get_acl(effective_path)
+                LOG.info('ACL of the filesystem on the array is %s',
+                         filesystem_acl)
+                LOG.info('ACL provided in the playbook is %s', acl_posix)
 
-                if filesystem_acl['authoritative'] == 'mode' \
-                        and new_authoritative == 'acl':
+                authoritative = (filesystem_acl['authoritative'],
+                                 new_authoritative)
+                if authoritative in ACL_CONVERSIONS or \
+                        (authoritative == ('acl', 'acl') and
+                         filesystem_acl['mode'] != acl_posix):
                     error_message = 'Modification of ACL from Ansible ' \
                                     'modules is only supported from ' \
                                     'POSIX to POSIX mode bits.'
                     LOG.error(error_message)
                     self.module.fail_json(msg=error_message)
 
-                if filesystem_acl['authoritative'] == 'acl' \
-                        and new_authoritative == 'acl':
-                    if filesystem_acl['mode'] != acl_posix:
-                        error_message = 'Modification of ACL from Ansible ' \
-                                        'modules is only supported from ' \
-                                        'POSIX to POSIX mode bits.'
-                        LOG.error(error_message)
-                        self.module.fail_json(msg=error_message)
-
                 if acl_posix != filesystem_acl['mode']:
                     return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Error {0} while determining if ' \
                             'ACLs are modified'.format(str(error_msg))
             LOG.error(error_message)
@@ -833,59 +827,38 @@ class IsilonFileSystem(object):
         """Determines if Quota is modified"""
         try:
             LOG.info('Determining if Quota is modified...')
-            if self.module.params['quota'] is not None \
-                    and filesystem_quota is not None and filesystem_quota[
-                'quotas'] and \
-                    self.module.params['quota']['quota_state'] == 'present':
-                quota = self.module.params['quota']
-                if 'include_snap_data' in quota and \
-                        quota['include_snap_data'] is not None:
-                    include_snap_data = quota['include_snap_data']
+            quota = self.module.params['quota']
+            if quota is not None \
+                    and filesystem_quota is not None and \
+                    filesystem_quota.quotas and \
+                    quota['quota_state'] == 'present':
+                array_quota = filesystem_quota.quotas[0]
+                include_snap_data = quota.get('include_snap_data')
+                if include_snap_data is not None:
                     if include_snap_data != \
-                            filesystem_quota['quotas'][0]['include_snapshots']:
+                            array_quota.include_snapshots:
                         error_message = 'The value of include_snap_data does '\
                                         'not match the state on the array. ' \
                                         'Modifying include_snap_data is ' \
                                         'not supported.'
                         LOG.error(error_message)
                         self.module.fail_json(msg=error_message)
-                if 'include_data_protection_overhead' in quota and \
-                        quota['include_data_protection_overhead'] is not None:
-                    include_data_protection_overhead = \
-                        quota['include_data_protection_overhead']
+                include_data_protection_overhead = \
+                    quota.get('include_data_protection_overhead')
+                if include_data_protection_overhead is not None:
                     if include_data_protection_overhead != \
-                            filesystem_quota['quotas'][0][
-                                'thresholds_include_overhead']:
-                        return True
-                if 'cap_unit' in quota and quota['cap_unit'] is not None:
-                    cap_unit = quota['cap_unit']
-                else:
-                    cap_unit = 'GB'
-                if 'advisory_limit_size' in quota and \
-                        quota['advisory_limit_size'] is not None:
-                    advisory_limit_size = utils.get_size_bytes(
-                        quota['advisory_limit_size'], cap_unit)
-                    if advisory_limit_size != \
-                            filesystem_quota['quotas'][0]['thresholds'][
-                                'advisory']:
-                        return True
-                if 'soft_limit_size' in quota and \
-                        quota['soft_limit_size'] is not None:
-                    soft_limit_size = utils.get_size_bytes(
-                        quota['soft_limit_size'], cap_unit)
-                    if soft_limit_size != \
-                            filesystem_quota['quotas'][0]['thresholds'][
-                                'soft']:
-                        return True
-                if 'hard_limit_size' in quota and \
-                        quota['hard_limit_size'] is not None:
-                    hard_limit_size = utils.get_size_bytes(
-                        quota['hard_limit_size'], cap_unit)
-                    if hard_limit_size != filesystem_quota[
-                            'quotas'][0]['thresholds']['hard']:
+                            array_quota.thresholds_include_overhead:
                         return True
+                # Stops at the first limit which differs from the array
+                unit_bytes = get_cap_unit_bytes(quota)
+                thresholds = array_quota.thresholds
+                return any(
+                    max(quota[limit], 0) * unit_bytes !=
+                    getattr(thresholds, threshold)
+                    for limit, threshold in QUOTA_LIMITS
+                    if quota.get(limit) is not None)
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Error {0} while determining ' \
                             'if Quotas are modified '.format((str(error_msg)))
             LOG.error(error_message)
@@ -893,47 +866,36 @@ class IsilonFileSystem(object):
 
     def validate_input(self):
         """Valid input parameters"""
-        if 'quota' in self.module.params \
-                and self.module.params['quota'] is not None:
-            if 'quota_state' not in self.module.params['quota']:
+        quota = self.module.params['quota']
+        if quota is not None:
+            if 'quota_state' not in quota:
                 self.module.fail_json(msg='quota_state is required while '
                                           'creating, deleting or modifying '
                                           'a quota')
-            if 'cap_unit' in self.module.params['quota'] \
-                    and self.module.params['quota']['cap_unit'] is not None:
-                if self.module.params['quota']['cap_unit'] not \
-                        in ('MB', 'mb', 'GB', 'gb', 'TB', 'tb'):
+            cap_unit = quota.get('cap_unit')
+            if cap_unit is not None:
+                if cap_unit not in ('MB', 'mb', 'GB', 'gb', 'TB', 'tb'):
                     self.module.fail_json(msg='Invalid cap_unit provided, '
                                               'only MB, GB and TB are '
                                               'supported.')
 
-        if self.module.params['path']:
-            if not self.module.params['path'].startswith('/'):
+        path = self.module.params['path']
+        if path:
+            if not path.startswith('/'):
                 self.module.fail_json(msg='Invalid path. '
                                           'The path provided must '
                                           'start with /')
 
-    def determine_error(self, error_obj):
-        """Determine the error message to return"""
-        if isinstance(error_obj, utils.ApiException):
-            error = re.sub("[\n \"]+", ' ', str(error_obj.body))
-        else:
-            error = str(error_obj)
-        return error
-
-    def get_filesystem_snapshots(self, effective_path):
-        """Get snapshots for a given filesystem"""
+    def get_filesystem_snapshots(self, path):
+        """Get snapshots for a given filesystem absolute path"""
         try:
-            snapshot_list = \
-                self.snapshot_api.list_snapshot_snapshots().to_dict()
-            snapshots = []
-
-            for snap in snapshot_list['snapshots']:
-                if snap['path'] == '/' + effective_path:
-                    snapshots.append(snap)
-            return snapshots
+            # The SDK can not filter the snapshots on their path, so only
+            # the snapshots of the path are serialized
+            snapshot_list = self.snapshot_api.list_snapshot_snapshots()
+            return [snap.to_dict() for snap in snapshot_list.snapshots or []
+                    if snap.path == path]
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to get filesystem snapshots ' \
                             'due to error {0}'.format((str(error_msg)))
             LOG.error(error_message)
@@ -941,13 +903,18 @@ class IsilonFileSystem(object):
 
     def get_owner_id(self, name, zone, provider):
         """Get the User Account Details in Isilon"""
+        key = (self.module.params['onefs_host'], 'USER:' + name, zone,
+               provider)
+        if key in PERSONAS:
+            return PERSONAS[key]
         try:
             resp = self.auth_api.get_auth_user(
                 auth_user_id='USER:' + name,
-                zone=zone, provider=provider).to_dict()
+                zone=zone, provider=provider)
+            PERSONAS[key] = resp
             return resp
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to get the owner id for owner ' \
                             '{0} in zone {1} and ' \
                             'provider {2} due ' \
@@ -956,15 +923,24 @@ class IsilonFileSystem(object):
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
-    def get_group_id(self, name, zone, provider):
-        """Get the group account details in Isilon"""
+    def get_group_id(self, name, zone, provider, group_job=None):
+        """Get the group account details in Isilon, group_job is the
+        lookup of the group if it has already been submitted"""
+        key = (self.module.params['onefs_host'], 'GROUP:' + name, zone,
+               provider)
+        if key in PERSONAS:
+            return PERSONAS[key]
         try:
-            resp = self.auth_api.get_auth_group(
-                auth_group_id='GROUP:' + name,
-                zone=zone, provider=provider).to_dict()
+            if group_job:
+                resp = group_job.result()
+            else:
+                resp = self.auth_api.get_auth_group(
+                    auth_group_id='GROUP:' + name,
+                    zone=zone, provider=provider)
+            PERSONAS[key] = resp
             return resp
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to get the group id for group ' \
                             '{0} in zone {1} and ' \
                             'provider {2} due ' \
@@ -974,56 +950,48 @@ class IsilonFileSystem(object):
             self.module.fail_json(msg=error_message)
 
     def is_owner_modified(self, effective_path, owner):
-        """Determines if the Owner for the FS is modified"""
+        """Determines if the Owner for the FS is modified, the owner must be
+        given. Returns the owner to set if it is modified"""
         try:
-            if owner:
-                LOG.info('Determining if owner is modified..')
-                if 'name' not in owner:
-                    error_message = 'Please specify a name for the owner.'
-                    LOG.error(error_message)
-                    self.module.fail_json(msg=error_message)
-                if 'provider_type' in owner:
-                    owner_provider = owner['provider_type']
-                else:
-                    owner_provider = 'local'
-
-                owner_details = self.get_owner_id(
-                    name=owner['name'],
-                    zone=self.module.params['access_zone'],
-                    provider=owner_provider)
-
-                owner_uid = owner_details['users'][0]['uid']['id']
-                owner_sid = owner_details['users'][0]['sid']['id']
-
-                owner = {'type': 'user', 'id': owner_uid,
-                         'name': owner['name']}
-
-                acl = \
-                    self.namespace_api.get_acl(effective_path,
-                                               acl=True).to_dict()
-                file_uid = acl['owner']['id']
-                info_message = 'The user ID fetched from playbook is ' \
-                               '{0} and the user ID on ' \
-                               'the file is {1}'.format(owner_uid, file_uid)
-                LOG.info(info_message)
-
-                modified = False
-                if owner_provider.lower() != 'ads' and \
-                        owner_uid != file_uid:
-                    modified = True
-                # For ADS providers, the SID of the owner gets set in the ACL
-                if owner_provider.lower() == 'ads' and owner_sid != file_uid:
-                    modified = True
-
-                if modified:
-                    LOG.info('Modifying owner..')
-                    self.modify_owner(owner, effective_path)
-                    return True
+            LOG.info('Determining if owner is modified..')
+            if 'name' not in owner:
+                error_message = 'Please specify a name for the owner.'
+                LOG.error(error_message)
+                self.module.fail_json(msg=error_message)
+            if 'provider_type' in owner:
+                owner_provider = owner['provider_type']
             else:
-                return False
+                owner_provider = 'local'
+
+            owner_details = self.get_owner_id(
+                name=owner['name'],
+                zone=self.module.params['access_zone'],
+                provider=owner_provider)
+
+            owner_uid = owner_details.users[0].uid.id
+            owner_sid = owner_details.users[0].sid.id
+
+            owner = {'type': 'user', 'id': owner_uid,
+                     'name': owner['name']}
+
+            acl = self.get_acl(effective_path)
+            file_uid = acl['owner']['id']
+            LOG.info('The user ID fetched from playbook is %s and the '
+                     'user ID on the file is %s', owner_uid, file_uid)
+
+            modified = False
+            if owner_provider.lower() != 'ads' and \
+                    owner_uid != file_uid:
+                modified = True
+            # For ADS providers, the SID of the owner gets set in the ACL
+            if owner_provider.lower() == 'ads' and owner_sid != file_uid:
+                modified = True
+
+            if modified:
+                return owner
 
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to determine if owner ' \
                             'is modified due to ' \
                             'error {0}'.format(str(error_msg))
@@ -1031,89 +999,69 @@ class IsilonFileSystem(object):
             self.module.fail_json(msg=error_message)
 
     def is_group_modified(self, effective_path, group):
-        """Determines if the Group for the FS is modified"""
+        """Determines if the Group for the FS is modified, the group must be
+        given. Returns the group to set if it is modified"""
         try:
-            if group:
-                LOG.info('Determining if group is modified..')
-                if 'name' not in group:
-                    error_message = 'Please specify a name for the group.'
-                    LOG.error(error_message)
-                    self.module.fail_json(msg=error_message)
-                if 'provider_type' in group:
-                    group_provider = group['provider_type']
-                else:
-                    group_provider = 'local'
+            LOG.info('Determining if group is modified..')
+            if 'name' not in group:
+                error_message = 'Please specify a name for the group.'
+                LOG.error(error_message)
+                self.module.fail_json(msg=error_message)
+            if 'provider_type' in group:
+                group_provider = group['provider_type']
+            else:
+                group_provider = 'local'
 
-                group_details = self.get_group_id(
-                    name=group['name'],
-                    zone=self.module.params['access_zone'],
-                    provider=group_provider)
+            group_details = self.get_group_id(
+                name=group['name'],
+                zone=self.module.params['access_zone'],
+                provider=group_provider)
 
-                group_uid = group_details['groups'][0]['gid']['id']
-                group_sid = group_details['groups'][0]['sid']['id']
+            group_uid = group_details.groups[0].gid.id
+            group_sid = group_details.groups[0].sid.id
 
-                group = {'type': 'group', 'id': group_uid,
-                         'name': group['name']}
+            group = {'type': 'group', 'id': group_uid,
+                     'name': group['name']}
 
-                acl = \
-                    self.namespace_api.get_acl(effective_path,
-                                               acl=True).to_dict()
-                file_gid = acl['group']['id']
-                info_message = 'The group ID fetched from playbook is ' \
-                               '{0} and the group ID on ' \
-                               'the file is {1}'.format(group_uid, file_gid)
-                LOG.info(info_message)
-
-                modified = False
-                if group_provider.lower() != 'ads' and \
-                        group_uid != file_gid:
-                    modified = True
-                # For ADS providers, the SID of the group gets set in the ACL
-                if group_provider.lower() == 'ads' and group_sid != file_gid:
-                    modified = True
-
-                if modified:
-                    LOG.info('Modifying group..')
-                    self.modify_group(group, effective_path)
-                    return True
-            else:
-                return False
+            acl = self.get_acl(effective_path)
+            file_gid = acl['group']['id']
+            LOG.info('The group ID fetched from playbook is %s and the '
+                     'group ID on the file is %s', group_uid, file_gid)
+
+            modified = False
+            if group_provider.lower() != 'ads' and \
+                    group_uid != file_gid:
+                modified = True
+            # For ADS providers, the SID of the group gets set in the ACL
+            if group_provider.lower() == 'ads' and group_sid != file_gid:
+                modified = True
+
+            if modified:
+                return group
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to determine if group ' \
                             'is modified due to ' \
                             'error {0}'.format(str(error_msg))
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
-    def modify_owner(self, owner, effective_path):
-        """Modifies the FS owner"""
-        try:
-            permissions = self.isi_sdk.NamespaceAcl(
-                authoritative='mode',
-                owner=owner)
-            self.namespace_api.set_acl(namespace_path=effective_path,
-                                       acl=True,
-                                       namespace_acl=permissions)
-        except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
-            error_message = 'Failed to modify owner ' \
-                            'due to error {0}'.format(str(error_msg))
-            LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
-
-    def modify_group(self, group, effective_path):
-        """Modifies the FS group"""
+    def modify_owner_group(self, owner, group, effective_path):
+        """Modifies the FS owner and group with a single request, either of
+        them can be None to keep it unchanged"""
+        self.acls.pop(effective_path, None)
         try:
             permissions = self.isi_sdk.NamespaceAcl(
                 authoritative='mode',
+                owner=owner,
                 group=group)
             self.namespace_api.set_acl(namespace_path=effective_path,
                                        acl=True,
                                        namespace_acl=permissions)
+            return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
-            error_message = 'Failed to modify group ' \
+            error_msg = utils.determine_error(e)
+            error_message = 'Failed to modify owner/group ' \
                             'due to error {0}'.format(str(error_msg))
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
@@ -1122,14 +1070,15 @@ class IsilonFileSystem(object):
         """Perform different actions on Snapshot based on user parameter
         chosen in playbook
         """
-        path = self.module.params['path']
-        access_zone = self.module.params['access_zone']
-        owner = self.module.params['owner']
-        group = self.module.params['group']
-        access_control = self.module.params['access_control']
-        recursive = self.module.params['recursive']
-        quota = self.module.params['quota']
-        state = self.module.params['state']
+        params = self.module.params
+        access_zone = params['access_zone']
+        owner = params['owner']
+        group = params['group']
+        access_control = params['access_control']
+        recursive = params['recursive']
+        quota = params['quota']
+        state = params['state']
+        list_snapshots = params['list_snapshots']
 
         result = dict(
             changed=False,
@@ -1148,10 +1097,10 @@ class IsilonFileSystem(object):
 
         self.validate_input()
 
-        effective_path = self.determine_path()
+        effective_path, absolute_path = self.determine_path()
 
-        filesystem = self.get_filesystem(effective_path)
-        filesystem_quota = self.get_quota(effective_path)
+        filesystem, filesystem_quota = self.prefetch(effective_path,
+                                                     absolute_path)
 
         is_acl_modified = False
         is_quota_modified = False
@@ -1159,10 +1108,18 @@ class IsilonFileSystem(object):
         if filesystem:
             is_acl_modified = self.is_acl_modified(effective_path)
             is_quota_modified = self.is_quota_modified(filesystem_quota)
-            result['modify_owner'] = \
-                self.is_owner_modified(effective_path, owner)
-            result['modify_group'] = \
-                self.is_group_modified(effective_path, group)
+            # The owner and group are only checked when given, and set
+            # together when both are modified
+            new_owner = new_group = None
+            if owner:
+                new_owner = self.is_owner_modified(effective_path, owner)
+            if group:
+                new_group = self.is_group_modified(effective_path, group)
+            if new_owner or new_group:
+                LOG.info('Modifying owner/group..')
+                self.modify_owner_group(new_owner, new_group, effective_path)
+                result['modify_owner'] = new_owner is not None
+                result['modify_group'] = new_group is not None
 
         if state == 'present' and not filesystem:
             LOG.info('Creating Filesystem...')
@@ -1181,22 +1138,25 @@ class IsilonFileSystem(object):
         if is_quota_modified:
             LOG.info('Modifying Quota..')
             result['modify_quota'] = self.modify_quota(quota,
-                                                       effective_path)
+                                                       absolute_path,
+                                                       filesystem_quota)
+
+        quota_state = quota['quota_state'] if quota is not None else None
+        # None when the Quota details could not be fetched
+        has_quota = None
+        if filesystem_quota is not None:
+            has_quota = bool(filesystem_quota.quotas)
 
         # There is no Quota on the filesystem.
         # The user specified a Quota in the playbook to be created.
-        if filesystem_quota is not None and 'quotas' in filesystem_quota \
-                and not filesystem_quota['quotas'] and filesystem is not \
-                None and quota is not None and \
-                self.module.params['quota']['quota_state'] == 'present':
-            result['add_quota'] = self.create_quota(quota, effective_path)
+        if has_quota is False and filesystem is not None and \
+                quota_state == 'present':
+            result['add_quota'] = self.create_quota(quota, absolute_path)
 
         # There is a Quota on the filesystem.
         # The user specified a Quota in the playbook to be removed.
-        if filesystem_quota is not None and 'quotas' in filesystem_quota and \
-                filesystem_quota['quotas'] and quota is not None and \
-                self.module.params['quota']['quota_state'] == 'absent':
-            result['delete_quota'] = self.delete_quota(effective_path)
+        if has_quota and quota_state == 'absent':
+            result['delete_quota'] = self.delete_quota(absolute_path)
 
         if state == 'absent' and filesystem:
             LOG.info('Deleting Filesystem...')
@@ -1204,25 +1164,36 @@ class IsilonFileSystem(object):
                 effective_path,
                 access_zone)
 
+        result['changed'] = any(result[operation]
+                                for operation in OPERATION_RESULTS)
+
         if state == 'present':
-            LOG.info('Getting filesystem details..')
-            resp = self.get_filesystem(effective_path)
-            result['filesystem_details'] = resp.to_dict()
-            result['quota_details'] = self.get_quota(effective_path)
-            if self.module.params['list_snapshots']:
+            # The details fetched above are still current when nothing
+            # changed, otherwise they are fetched again
+            if result['changed']:
+                LOG.info('Getting filesystem details..')
+                filesystem, filesystem_quota = self.prefetch(effective_path,
+                                                             absolute_path)
+            result['filesystem_details'] = filesystem.to_dict()
+            # The Quota is only serialized for the module result
+            if filesystem_quota is not None:
+                result['quota_details'] = filesystem_quota.to_dict()
+            else:
+                result['quota_details'] = None
+            if list_snapshots:
                 result['filesystem_snapshots'] = \
-                    self.get_filesystem_snapshots(effective_path)
-
-        if result['create_filesystem'] or result['delete_filesystem'] or \
-                result['modify_filesystem'] or result['add_quota'] \
-                or result['delete_quota'] or result['modify_quota'] or \
-                result['modify_owner'] or result['modify_group']:
-            result['changed'] = True
+                    self.get_filesystem_snapshots(absolute_path)
 
         # Finally update the module result!
         self.module.exit_json(**result)
 
 
+def get_cap_unit_bytes(quota):
+    """Get the number of bytes in the capacity unit of the quota limits,
+    which defaults to GB"""
+    return CAP_UNIT_IN_BYTES[(quota.get('cap_unit') or 'GB').upper()]
+
+
 def get_isilon_filesystem_parameters():
     return dict(
         path=dict(required=True, type='str'),
@@ -129,20 +129,38 @@ EXAMPLES = r'''
 RETURN = r''' '''
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.storage.dell \
     import dellemc_ansible_isilon_utils as utils
-import re
 
 LOG = utils.get_logger('dellemc_isilon_gatherfacts',
                        log_devel=logging.INFO)
 HAS_ISILON_SDK = utils.has_isilon_sdk()
 ISILON_SDK_VERSION_CHECK = utils.isilon_sdk_version_check()
 
+# Number of users or groups fetched from OneFS per request
+AUTH_LIST_PAGE_SIZE = 1000
+
+# Result key and getter of each gather subset, and whether the getter
+# lists the entities of the requested access zone
+SUBSET_GETTERS = {
+    'attributes': ('Attributes', 'get_attributes_list', False),
+    'access_zones': ('AccessZones', 'get_access_zones_list', False),
+    'nodes': ('Nodes', 'get_nodes_list', False),
+    'providers': ('Providers', 'get_providers_list', True),
+    'users': ('Users', 'get_users_list', True),
+    'groups': ('Groups', 'get_groups_list', True)
+}
+
 
 class IsilonGatherFacts(object):
     """Class with Gather Fact operations"""
 
+    __slots__ = ('module_params', 'module', 'host', 'api_client', 'isi_sdk',
+                 '_cluster_api', '_zone_api', '_auth_api', 'executor',
+                 'errors')
+
     def __init__(self):
         """Define all the parameters required by this module"""
 
@@ -155,85 +173,125 @@ class IsilonGatherFacts(object):
                                     supports_check_mode=False
                                     )
 
-        if HAS_ISILON_SDK is False:
-            self.module.fail_json(msg='Ansible modules for Isilon '
-                                      'require the Isilon python library'
-                                      ' to be installed. Please install'
-                                      ' the library before using these '
-                                      'modules.')
-
         if ISILON_SDK_VERSION_CHECK and \
                 not ISILON_SDK_VERSION_CHECK['supported_version']:
             err_msg = ISILON_SDK_VERSION_CHECK['unsupported_version_message']
             LOG.error(err_msg)
             self.module.fail_json(msg=err_msg)
 
-        self.api_client = utils.get_isilon_connection(self.module.params)
+        # All the subsets and cluster attributes can be requested at the
+        # same time, so the pool is sized to keep all of them alive
+        self.host = self.module.params['onefs_host']
+
+        self.api_client = utils.get_isilon_connection(self.module.params,
+                                                      pool_maxsize=16)
         self.isi_sdk = utils.get_isilon_sdk()
         LOG.info('Got python SDK instance for provisioning on Isilon ')
 
-        self.cluster_api = self.isi_sdk.ClusterApi(self.api_client)
-        self.zone_api = self.isi_sdk.ZonesApi(self.api_client)
-        self.auth_api = self.isi_sdk.AuthApi(self.api_client)
+        # The SDK apis are created on first use, so that only the apis of
+        # the requested subsets are built
+        self._cluster_api = None
+        self._zone_api = None
+        self._auth_api = None
+
+        # The subsets are independent of each other and are gathered
+        # concurrently. fail_json must not be called from the worker
+        # threads, so their errors are collected and reported together.
+        self.executor = ThreadPoolExecutor(max_workers=6)
+        self.errors = []
+
+    @property
+    def cluster_api(self):
+        """Cluster api of the SDK"""
+        if self._cluster_api is None:
+            self._cluster_api = self.isi_sdk.ClusterApi(self.api_client)
+        return self._cluster_api
+
+    @property
+    def zone_api(self):
+        """Zones api of the SDK"""
+        if self._zone_api is None:
+            self._zone_api = self.isi_sdk.ZonesApi(self.api_client)
+        return self._zone_api
+
+    @property
+    def auth_api(self):
+        """Auth api of the SDK"""
+        if self._auth_api is None:
+            self._auth_api = self.isi_sdk.AuthApi(self.api_client)
+        return self._auth_api
 
     def get_attributes_list(self):
         """Get the list of attributes of a given Isilon Storage"""
         try:
-            config = (self.cluster_api.get_cluster_config()).to_dict()
-            ips = self.cluster_api.get_cluster_external_ips()
-            external_ip_str = ','.join(ips)
+            # The cluster attributes are independent GETs, so they are
+            # fetched concurrently on a pool of their own
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                config_job = executor.submit(
+                    self.cluster_api.get_cluster_config)
+                ips_job = executor.submit(
+                    self.cluster_api.get_cluster_external_ips)
+                identity_job = executor.submit(
+                    self.cluster_api.get_cluster_identity)
+                owner_job = executor.submit(
+                    self.cluster_api.get_cluster_owner)
+                version_job = executor.submit(
+                    self.cluster_api.get_cluster_version)
+
+            config = config_job.result().to_dict()
+            ips = ips_job.result() or ()
+            external_ip_str = ','.join(ips) if ips else ''
             external_ips = {"External IPs": external_ip_str}
-            logon_msg = (self.cluster_api.get_cluster_identity()).to_dict()
-            contact_info = (self.cluster_api.get_cluster_owner()).to_dict()
-            cluster_version = (self.cluster_api.get_cluster_version())\
-                .to_dict()
+            logon_msg = identity_job.result().to_dict()
+            contact_info = owner_job.result().to_dict()
+            cluster_version = version_job.result().to_dict()
             attribute = {"Config": config, "Contact_Info": contact_info,
                          "External_IP": external_ips,
                          "Logon_msg": logon_msg,
                          "Cluster_Version": cluster_version}
             LOG.info("Got Attributes of Isilon cluster %s",
-                     self.module.params['onefs_host'])
+                     self.host)
             return attribute
         except Exception as e:
             error_msg = (
                 'Get Attributes List for Isilon cluster: {0} failed'
                 ' with error: {1}' .format(
-                    self.module.params['onefs_host'],
-                    self.determine_error(e)))
+                    self.host,
+                    utils.determine_error(e)))
             LOG.error(error_msg)
-            self.module.fail_json(msg=error_msg)
+            self.errors.append(error_msg)
 
     def get_access_zones_list(self):
         """Get the list of access_zones of a given Isilon Storage"""
         try:
             access_zones_list = (self.zone_api.list_zones()).to_dict()
             LOG.info("Got Access zones from Isilon cluster %s",
-                     self.module.params['onefs_host'])
+                     self.host)
             return access_zones_list
         except Exception as e:
             error_msg = (
                 'Get Access zone List for Isilon cluster: {0} failed'
                 'with error: {1}' .format(
-                    self.module.params['onefs_host'],
-                    self.determine_error(e)))
+                    self.host,
+                    utils.determine_error(e)))
             LOG.error(error_msg)
-            self.module.fail_json(msg=error_msg)
+            self.errors.append(error_msg)
 
     def get_nodes_list(self):
         """Get the list of nodes of a given Isilon Storage"""
         try:
             nodes_list = (self.cluster_api.get_cluster_nodes()).to_dict()
             LOG.info('Got Nodes from Isilon cluster  %s',
-                     self.module.params['onefs_host'])
+                     self.host)
             return nodes_list
         except Exception as e:
             error_msg = (
                 'Get Nodes List for Isilon cluster: {0} failed with'
                 'error: {1}' .format(
-                    self.module.params['onefs_host'],
-                    self.determine_error(e)))
+                    self.host,
+                    utils.determine_error(e)))
             LOG.error(error_msg)
-            self.module.fail_json(msg=error_msg)
+            self.errors.append(error_msg)
 
     def get_providers_list(self, access_zone):
         """Get the list of authentication providers for an access zone of a
@@ -243,64 +301,71 @@ class IsilonGatherFacts(object):
                               .get_providers_summary(zone=access_zone))\
                 .to_dict()
             LOG.info('Got authentication Providers from Isilon cluster %s',
-                     self.module.params['onefs_host'])
+                     self.host)
             return providers_list
         except Exception as e:
             error_msg = (
                 'Get authentication Providers List for Isilon'
                 ' cluster: {0} and access zone: {1} failed with'
                 ' error: {2}' .format(
-                    self.module.params['onefs_host'],
+                    self.host,
                     access_zone,
-                    self.determine_error(e)))
+                    utils.determine_error(e)))
             LOG.error(error_msg)
-            self.module.fail_json(msg=error_msg)
+            self.errors.append(error_msg)
+
+    def get_auth_list(self, list_api, key, access_zone):
+        """Get all the users or groups of an access zone, page by page, so
+        that OneFS does not serialize the whole list in one response"""
+        response = list_api(zone=access_zone, limit=AUTH_LIST_PAGE_SIZE)
+        auth_list = response.to_dict()
+        items = auth_list[key] or []
+        # The resume token carries the zone and limit of the first request
+        while response.resume:
+            response = list_api(resume=response.resume)
+            items.extend(
+                item.to_dict() for item in getattr(response, key) or [])
+        # The first page keeps its total, every page has been fetched
+        auth_list[key] = items
+        auth_list['resume'] = None
+        return auth_list
 
     def get_users_list(self, access_zone):
         """Get the list of users for an access zone of a given Isilon
         Storage"""
         try:
-            users_list = (self.auth_api.list_auth_users(zone=access_zone))\
-                .to_dict()
+            users_list = self.get_auth_list(
+                self.auth_api.list_auth_users, 'users', access_zone)
             LOG.info('Got Users from Isilon cluster %s',
-                     self.module.params['onefs_host'])
+                     self.host)
             return users_list
         except Exception as e:
             error_msg = (
                 'Get Users List for Isilon cluster: {0} and access zone: {1} '
                 'failed with error: {2}' .format(
-                    self.module.params['onefs_host'],
+                    self.host,
                     access_zone,
-                    self.determine_error(e)))
+                    utils.determine_error(e)))
             LOG.error(error_msg)
-            self.module.fail_json(msg=error_msg)
+            self.errors.append(error_msg)
 
     def get_groups_list(self, access_zone):
         """Get the list of groups for an access zone of a given Isilon
         Storage"""
         try:
-            group_list = (
-                self.auth_api.list_auth_groups(
-                    zone=access_zone)).to_dict()
+            group_list = self.get_auth_list(
+                self.auth_api.list_auth_groups, 'groups', access_zone)
             LOG.info('Got Groups from Isilon cluster %s',
-                     self.module.params['onefs_host'])
+                     self.host)
             return group_list
         except Exception as e:
             error_msg = ('Get Group List for Isilon cluster: {0} and'
                          'access zone: {1} failed with error: {2}'.format(
-                             self.module.params['onefs_host'],
+                             self.host,
                              access_zone,
-                             self.determine_error(e)))
+                             utils.determine_error(e)))
             LOG.error(error_msg)
-            self.module.fail_json(msg=error_msg)
-
-    def determine_error(self, error_obj):
-        '''Format the error object'''
-        if isinstance(error_obj, utils.ApiException):
-            error = re.sub("[\n \"]+", ' ', str(error_obj.body))
-        else:
-            error = str(error_obj)
-        return error
+            self.errors.append(error_msg)
 
     def perform_module_operation(self):
         """Perform different actions on Gatherfacts based on user parameter
@@ -310,32 +375,23 @@ class IsilonGatherFacts(object):
         subset = self.module.params['gather_subset']
         if not subset:
             self.module.fail_json(msg="Please specify gather_subset")
+        subset = frozenset(subset)
+
+        jobs = {}
+        for name in subset:
+            result_key, getter, needs_zone = SUBSET_GETTERS[name]
+            args = (access_zone,) if needs_zone else ()
+            jobs[result_key] = self.executor.submit(getattr(self, getter),
+                                                    *args)
 
-        attributes = []
-        access_zones = []
-        nodes = []
-        providers = []
-        users = []
-        groups = []
-        if 'attributes' in str(subset):
-            attributes = self.get_attributes_list()
-        if 'access_zones' in str(subset):
-            access_zones = self.get_access_zones_list()
-        if 'nodes' in str(subset):
-            nodes = self.get_nodes_list()
-        if 'providers' in str(subset):
-            providers = self.get_providers_list(access_zone)
-        if 'users' in str(subset):
-            users = self.get_users_list(access_zone)
-        if 'groups' in str(subset):
-            groups = self.get_groups_list(access_zone)
-        self.module.exit_json(
-            Attributes=attributes,
-            AccessZones=access_zones,
-            Nodes=nodes,
-            Providers=providers,
-            Users=users,
-            Groups=groups)
+        facts = dict((result_key, []) for result_key, getter, needs_zone
+                     in SUBSET_GETTERS.values())
+        facts.update((result_key, job.result())
+                     for result_key, job in jobs.items())
+        if self.errors:
+            self.module.fail_json(msg=' '.join(self.errors))
+
+        self.module.exit_json(**facts)
 
 
 def get_isilon_gatherfacts_parameters():
@@ -358,6 +414,18 @@ def get_isilon_gatherfacts_parameters():
 def main():
     """Create Isilon GatherFacts object and perform action on it
         based on user input from playbook"""
+    if HAS_ISILON_SDK is False:
+        # Without the SDK nothing can be gathered, so only the Ansible module
+        # is built to report the error
+        module_params = utils.get_isilon_management_host_parameters()
+        module_params.update(get_isilon_gatherfacts_parameters())
+        module = AnsibleModule(argument_spec=module_params,
+                               supports_check_mode=False)
+        module.fail_json(msg='Ansible modules for Isilon require the Isilon'
+                             ' python library to be installed. Please'
+                             ' install the library before using these'
+                             ' modules.')
+
     obj = IsilonGatherFacts()
     obj.perform_module_operation()
 
@@ -32,13 +32,13 @@ options:
     - The path on which the quota will be imposed.
     - For system access zone, the path is absolute. For all other access
       zones, the path is a relative path from the base of the access zone.
+    - Required unless quotas is given.
     type: str
-    required: True
   quota_type:
     description:
     - The type of quota which will be imposed on path.
+    - Required unless quotas is given.
     type: str
-    required: True
     choices: ['user', 'group', 'directory']
   user_name:
     description:
@@ -133,13 +133,112 @@ options:
     - Define whether the Smart Quota should exist or not.
     - present - indicates that the Smart Quota should exist on the system.
     - absent - indicates that the Smart Quota should not exist on the system.
+    - Required unless quotas is given.
     choices: ['absent', 'present']
     type: str
-    required: True
+  quotas:
+    description:
+    - List of Smart Quotas to manage in a single task, instead of the
+      quota given by path.
+    - The quotas are managed in the given order. If one of them fails, the
+      changes and details of the quotas managed before it are reported with
+      the failure.
+    - Mutually exclusive with path, quota_type and state.
+    type: list
+    elements: dict
+    suboptions:
+      path:
+        description:
+        - The path on which the quota will be imposed.
+        - For system access zone, the path is absolute. For all other access
+          zones, the path is a relative path from the base of the access
+          zone.
+        required: true
+        type: str
+      quota_type:
+        description:
+        - The type of quota which will be imposed on path.
+        required: true
+        type: str
+        choices: ['user', 'group', 'directory']
+      user_name:
+        description:
+        - The name of the user account for which
+          quota operations will be performed.
+        - Required if quota_type is user.
+        type: str
+      group_name:
+        description:
+        - The name of the group for which quota operations will be
+          performed.
+        - Required if quota_type is group.
+        type: str
+      access_zone:
+        description:
+        - The zone in which user/group exists.
+        type: str
+        default: 'system'
+      provider_type:
+        description:
+        - The type which is used to authenticate the user/group.
+        type: str
+        default: 'local'
+        choices: [ 'local', 'file', 'ldap', 'ads']
+      quota:
+        description:
+        - Specifies Smart Quota parameters.
+        type: dict
+        suboptions:
+          include_snapshots:
+            description:
+            - Whether to include the snapshots in the quota or not.
+            type: bool
+            default: False
+          include_overheads:
+            description:
+            - Whether to include the data protection overheads
+              in the quota or not.
+            type: bool
+          advisory_limit_size:
+            description:
+            - The threshold value after which the advisory notification
+              will be sent.
+            type: int
+          soft_limit_size:
+            description:
+            - Threshold value after which soft limit exceeded notification
+              will be sent and soft_grace period will start.
+            type: int
+          soft_grace_period:
+            description:
+            - Grace Period after the soft limit for quota is exceeded.
+            type: int
+          period_unit:
+            description:
+            - Unit of the time period for soft_grace_period.
+            type: str
+            choices: ['days', 'weeks', 'months']
+          hard_limit_size:
+            description:
+            - Threshold value after which hard limit exceeded
+              notification will be sent.
+            type: int
+          cap_unit:
+            description:
+            - Unit of storage for the hard, soft and advisory limits.
+            type: str
+            choices: ['GB', 'TB']
+      state:
+        description:
+        - Define whether the Smart Quota should exist or not.
+        required: true
+        choices: ['absent', 'present']
+        type: str
 
 notes:
 - To perform any operation, path, quota_type and state are
-  mandatory parameters.
+  mandatory parameters, either for the module or for each element of
+  quotas.
 - There can be two quotas for each type per directory, one with snapshots
   included, and one without snapshots included.
 - Once the limits are assigned then the quota can't be converted to
@@ -227,6 +326,27 @@ EXAMPLES = r'''
       quota:
         include_snapshots: "True"
       state: "absent"
+
+  - name: Create Quotas for a Directory and a User in a single task
+    dellemc_isilon_smartquota:
+      onefs_host: "{{onefs_host}}"
+      verify_ssl: "{{verify_ssl}}"
+      api_user: "{{api_user}}"
+      api_password: "{{api_password}}"
+      quotas:
+        - path: "{{path}}"
+          quota_type: "directory"
+          quota:
+            include_snapshots: "True"
+          state: "present"
+        - path: "{{path}}"
+          quota_type: "user"
+          user_name: "{{user_name}}"
+          access_zone: "{{access_zone}}"
+          quota:
+            hard_limit_size: "{{hard_limit_size}}"
+            cap_unit: "{{cap_unit}}"
+          state: "present"
 '''
 RETURN = r'''
 changed:
@@ -235,6 +355,15 @@ changed:
     type: bool
     sample: True
 
+quotas_details:
+    description:
+        - The details of each quota given by quotas, in the same order.
+        - Quotas which do not exist are returned as null, the details of the
+          others are the same as quota_details.
+    type: list
+    returned: When quotas is given. On failure, only the quotas managed
+              before the failing one are returned.
+
 quota_details:
     description: The quota details.
     type: complex
@@ -286,15 +415,36 @@ quota_details:
                 }
 '''
 
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.storage.dell \
     import dellemc_ansible_isilon_utils as utils
-import re
 
 LOG = utils.get_logger('dellemc_isilon_smartquota',
                        log_devel=utils.logging.INFO)
-HAS_ISILON_SDK = utils.has_isilon_sdk()
-ISILON_SDK_VERSION_CHECK = utils.isilon_sdk_version_check()
+# Number of seconds in each unit of the soft grace period
+PERIOD_UNIT_IN_SECONDS = {
+    'days': 86400,
+    'weeks': 7 * 86400,
+    'months': 30 * 86400
+}
+
+# Threshold limits of a quota that can be modified
+THRESHOLD_KEYS = ('advisory', 'soft', 'hard', 'soft_grace')
+
+# SIDs of the users and groups already looked up, keyed by OneFS host,
+# persona type, name, provider and access zone
+SIDS = {}
+
+# Base paths of the access zones already looked up, keyed by OneFS host and
+# access zone name, so a zone is only fetched once per process
+ZONE_BASE_PATHS = {}
+
+# Name parameter required by each persona quota type
+PERSONA_REQUIRED_IF = [
+    ['quota_type', 'user', ['user_name']],
+    ['quota_type', 'group', ['group_name']]
+]
 
 
 class IsilonSmartQuota(object):
@@ -303,40 +453,53 @@ class IsilonSmartQuota(object):
     def __init__(self):
         """ Define all parameters required by this module"""
 
-        self.module_params = utils.get_isilon_management_host_parameters()
-        self.module_params.update(get_isilon_smartquota_parameters())
-        mut_ex_args = [['group_name', 'user_name']]
-        req_if_args = [
-            ['quota_type', 'user', ['user_name']],
-            ['quota_type', 'group', ['group_name']]
-        ]
+        # None of the single quota options are used together with quotas
+        mut_ex_args = [['group_name', 'user_name']] + [
+            [option, 'quotas'] for option in (
+                'path', 'quota_type', 'user_name', 'group_name',
+                'access_zone', 'provider_type', 'quota', 'state')]
+        req_one_of_args = [['path', 'quotas']]
+        req_together_args = [['path', 'quota_type', 'state']]
 
         # initialize the ansible module
-        self.module = AnsibleModule(argument_spec=self.module_params,
+        self.module = AnsibleModule(argument_spec=ARGUMENT_SPEC,
                                     supports_check_mode=False,
                                     mutually_exclusive=mut_ex_args,
-                                    required_if=req_if_args)
+                                    required_one_of=req_one_of_args,
+                                    required_together=req_together_args,
+                                    required_if=PERSONA_REQUIRED_IF)
 
         # result is a dictionary that contains changed status and
         # smart quota details
         self.result = {"changed": False}
-        if HAS_ISILON_SDK is False:
-            self.module.fail_json(
+        # The SDK is only probed once the playbook arguments are valid
+        if utils.has_isilon_sdk() is False:
+            self.fail_json(
                 msg="Ansible modules for Isilon require the isilon "
                     "python library to be installed. Please install"
                     " the library  before using these modules.")
 
-        if ISILON_SDK_VERSION_CHECK and \
-                not ISILON_SDK_VERSION_CHECK['supported_version']:
-            err_msg = ISILON_SDK_VERSION_CHECK['unsupported_version_message']
+        isilon_sdk_version_check = utils.isilon_sdk_version_check()
+        if isilon_sdk_version_check and \
+                not isilon_sdk_version_check['supported_version']:
+            err_msg = isilon_sdk_version_check['unsupported_version_message']
             LOG.error(err_msg)
-            self.module.fail_json(msg=err_msg)
+            self.fail_json(msg=err_msg)
 
         self.api_client = utils.get_isilon_connection(self.module.params)
         self.auth_api_instance = utils.isi_sdk.AuthApi(self.api_client)
         self.zone_summary_api = utils.isi_sdk.ZonesSummaryApi(
             self.api_client)
         self.quota_api_instance = utils.isi_sdk.QuotaApi(self.api_client)
+        # Lookup api, id prefix and response attribute of each persona type
+        self.persona_apis = {
+            'user': (self.auth_api_instance.get_auth_user, 'USER:', 'users'),
+            'group': (self.auth_api_instance.get_auth_group, 'GROUP:',
+                      'groups')
+        }
+        # Runs the lookups that do not depend on each other alongside the
+        # main thread, which alone reports failures through fail_json
+        self.executor = ThreadPoolExecutor(max_workers=1)
 
         LOG.info('Got the isi_sdk instance for Smart Quota Operations')
 
@@ -346,72 +509,58 @@ class IsilonSmartQuota(object):
         :param access_zone: Name of the Access Zone.
         :return: Base Path of the Access Zone.
         """
+        key = (self.module.params['onefs_host'], access_zone)
+        if key in ZONE_BASE_PATHS:
+            return ZONE_BASE_PATHS[key]
         try:
             zone_path = (self.zone_summary_api.
                          get_zones_summary_zone(access_zone)).to_dict()
             zone_base_path = zone_path['summary']['path']
             LOG.info("Successfully got zone_base_path for %s is %s",
                      access_zone, zone_base_path)
+            ZONE_BASE_PATHS[key] = zone_base_path
             return zone_base_path
         except Exception as e:
             error_message = 'Unable to fetch base path of Access Zone %s' \
                             ',failed with error: %s' \
-                            % (access_zone, determine_error(e))
+                            % (access_zone, utils.determine_error(e))
             LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
+            self.fail_json(msg=error_message)
 
     def create(self, path, quota_type, zone,
-               quota_dict, persona=None):
+               quota_dict, has_limit, persona=None):
         """
         Create a Smart Quota.
         :param path: The path for which quota has to be created.
         :param quota_type: The type of the quota.
         :param zone: The zone in which user/group exists.
         :param quota_dict: Threshold limits dictionary containing all limits.
+        :param has_limit: Whether any advisory/soft/hard limit is provided.
         :param persona: User/Group object.
         :return: Quota Id.
         """
-        if quota_dict:
-            threshold_obj = utils.isi_sdk.QuotaQuotaThresholds(
-                quota_dict['advisory'], hard=quota_dict['hard'],
-                soft=quota_dict['soft'],
-                soft_grace=quota_dict['soft_grace'])
-        else:
-            threshold_obj = utils.isi_sdk.QuotaQuotaThresholds()
-
-        enforced = False
-        if quota_dict and (quota_dict['hard'] or quota_dict['soft']
-                           or quota_dict['advisory']):
-            enforced = True
-
-        # if not passed during creation of Quota
-        # Set include_overheads as False
-        if quota_dict is None or quota_dict['include_overheads'] is None:
-            include_overhead = False
-        else:
-            include_overhead = quota_dict['include_overheads']
-        if quota_dict is None or quota_dict['include_snapshots'] is None:
-            include_snapshots = False
+        if quota_dict is None:
+            # An accounting quota has no thresholds and is not enforced.
+            # The SDK requires enforced and thresholds_include_overhead to
+            # be set.
+            quota_params_obj = utils.isi_sdk.QuotaQuotaCreateParams(
+                include_snapshots=False, path=path, enforced=False,
+                persona=persona, thresholds_include_overhead=False,
+                thresholds=utils.isi_sdk.QuotaQuotaThresholds(),
+                type=quota_type)
         else:
-            include_snapshots = quota_dict['include_snapshots']
-
-        quota_params_obj = utils.isi_sdk.QuotaQuotaCreateParams(
-            include_snapshots=include_snapshots, path=path,
-            enforced=enforced,
-            persona=persona,
-            thresholds_include_overhead=include_overhead,
-            thresholds=threshold_obj, type=quota_type)
+            quota_params_obj = get_quota_create_params(
+                path, quota_type, quota_dict, has_limit, persona)
         try:
             api_response = self.quota_api_instance.create_quota_quota(
                 quota_quota=quota_params_obj, zone=zone)
-            message = "Quota created, %s" % api_response
-            LOG.info(message)
+            LOG.info("Quota created, %s", api_response)
             return api_response
         except utils.ApiException as e:
             error_message = "Create quota for %s failed with %s" \
-                            % (path, determine_error(e))
+                            % (path, utils.determine_error(e))
             LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
+            self.fail_json(msg=error_message)
 
     def update(self, quota_dict, quota_id, enforced, path):
         """
@@ -432,48 +581,53 @@ class IsilonSmartQuota(object):
         try:
             self.quota_api_instance.update_quota_quota(
                 quota_quota=quota_params_obj, quota_quota_id=quota_id)
-            msg = "Quota Updated successfully for path %s" % path
-            LOG.info(msg)
+            LOG.info("Quota Updated successfully for path %s", path)
             return True
         except utils.ApiException as e:
             error_message = "Update quota for path %s failed with %s" \
-                            % (path, determine_error(e))
+                            % (path, utils.determine_error(e))
             LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
+            self.fail_json(msg=error_message)
 
-    def get_sid(self, name, type, provider, zone):
+    def lookup_sid(self, name, type, provider, zone):
+        """
+        Look up the User/Group Account's SID in Isilon. SIDs do not change,
+        so the SIDs already looked up are served from SIDS.
+        :param name: Name of the resource.
+        :param type: Whether resource is of User or Group.
+        :param provider: Authentication type for the resource.
+        :param zone: Access Zone in which resource exists.
+        :return: sid of the resource.
+        """
+        key = (self.module.params['onefs_host'], type, name, provider, zone)
+        if key not in SIDS:
+            lookup_api, id_prefix, attribute = self.persona_apis[type]
+            api_response = lookup_api(id_prefix + name, zone=zone,
+                                      provider=provider)
+            SIDS[key] = getattr(api_response, attribute)[0].sid.id
+        return SIDS[key]
+
+    def get_sid(self, name, type, provider, zone, sid_job):
         """
         Get the User/Group Account's SID in Isilon.
         :param name: Name of the resource.
         :param type: Whether resource is of User or Group.
         :param provider: Authentication type for the resource.
         :param zone: Access Zone in which resource exists.
+        :param sid_job: Pending lookup_sid call for the resource.
         :return: sid of the resource.
         """
         try:
-            if type == 'user':
-                api_response = self.auth_api_instance.get_auth_user(
-                    auth_user_id='USER:' + name,
-                    zone=zone, provider=provider)
-                msg = "SID of the user: %s" % api_response.users[0].sid.id
-                LOG.info(msg)
-                return api_response.users[0].sid.id
-
-            elif type == 'group':
-                api_response = self.auth_api_instance.get_auth_group(
-                    auth_group_id='GROUP:' + name, zone=zone,
-                    provider=provider)
-                msg = "SID of the group: %s" % api_response.groups[0].sid.id
-                LOG.info(msg)
-                return api_response.groups[0].sid.id
-
+            sid = sid_job.result()
+            LOG.info("SID of the %s: %s", type, sid)
+            return sid
         except Exception as e:
             error_message = "Failed to get {0} details for " \
                             "AccessZone:{1} and Provider:{2} " \
                             "with error {3}" \
-                .format(name, zone, provider, determine_error(e))
+                .format(name, zone, provider, utils.determine_error(e))
             LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
+            self.fail_json(msg=error_message)
 
     def get_quota_details(self, include_snapshots,
                           zone, type, path, persona=None):
@@ -484,7 +638,7 @@ class IsilonSmartQuota(object):
         :param type: The type of the quota.
         :param path: The path for which quota exists.
         :param persona: User/Group object.
-        :return: if exists returns details of the Quota and Quota's Id,
+        :return: if exists returns the Quota object and Quota's Id,
          else returns None.
         """
         try:
@@ -497,19 +651,18 @@ class IsilonSmartQuota(object):
                     include_snapshots=include_snapshots, zone=zone,
                     persona=persona, type=type, path=path)
             if api_response.quotas:
-                quota_id = api_response.quotas[0].id
-                quota = api_response.quotas[0].to_dict()
-                msg = "Get Quota Details Successful. Quota Details: %s"\
-                      % quota
-                LOG.info(msg)
-                return quota, quota_id
+                # The SDK object is only serialized for the module result
+                quota = api_response.quotas[0]
+                LOG.info("Get Quota Details Successful. Quota Id: %s",
+                         quota.id)
+                return quota, quota.id
             LOG.info("Get Quota Details Failed. Quota does not exist.")
             return None, None
         except Exception as e:
             error_message = "Get Quota Details for %s failed with %s" \
-                            % (path, determine_error(e))
+                            % (path, utils.determine_error(e))
             LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
+            self.fail_json(msg=error_message)
 
     def delete(self, quota_id, path):
         """
@@ -520,14 +673,13 @@ class IsilonSmartQuota(object):
         """
         try:
             self.quota_api_instance.delete_quota_quota(quota_id)
-            msg = "Quota Deleted Successfully for Path %s" % path
-            LOG.info(msg)
+            LOG.info("Quota Deleted Successfully for Path %s", path)
             return True
         except Exception as e:
             error_message = "Delete quota for %s failed with %s" \
-                            % (path, determine_error(e))
+                            % (path, utils.determine_error(e))
             LOG.error(error_message)
-            self.module.fail_json(msg=error_message)
+            self.fail_json(msg=error_message)
 
     def convert_quota_thresholds(self, quota):
         """
@@ -535,95 +687,138 @@ class IsilonSmartQuota(object):
         :param quota: Threshold limits dictionary containing all limits.
         :return: Converted Threshold limits dictionary.
         """
-        limit_params = ['advisory_limit_size', 'soft_limit_size',
-                        'hard_limit_size', 'soft_grace_period']
-        for limit in quota.keys():
-            if limit in limit_params:
-                if quota[limit] is not None and quota[limit] <= 0:
-                    self.module.fail_json(
+        for limit, threshold in (('advisory_limit_size', 'advisory'),
+                                 ('soft_limit_size', 'soft'),
+                                 ('hard_limit_size', 'hard')):
+            size = quota.pop(limit)
+            if size is not None:
+                if size <= 0:
+                    self.fail_json(
                         msg="Invalid %s provided, must be greater than 0"
                             % limit)
-                if limit == 'soft_grace_period':
-                    if quota[limit] is not None and quota[limit] > 0:
-                        quota[limit] = period_to_seconds(
-                            quota[limit], quota['period_unit'])
-                elif quota[limit] is not None and quota[limit] > 0:
-                    quota[limit] = utils.get_size_bytes(
-                        quota[limit], quota['cap_unit'])
-        quota['advisory'] = quota.pop('advisory_limit_size')
-        quota['soft'] = quota.pop('soft_limit_size')
-        quota['hard'] = quota.pop('hard_limit_size')
-        quota['soft_grace'] = quota.pop('soft_grace_period')
+                size = utils.get_size_bytes(size, quota['cap_unit'])
+            quota[threshold] = size
+
+        soft_grace = quota.pop('soft_grace_period')
+        if soft_grace is not None:
+            if soft_grace <= 0:
+                self.fail_json(
+                    msg="Invalid soft_grace_period provided, must be greater"
+                        " than 0")
+            soft_grace = period_to_seconds(soft_grace, quota['period_unit'])
+        quota['soft_grace'] = soft_grace
         return quota
 
+    def fail_json(self, msg):
+        """Fail the module, reporting the changes and the details of the
+        quotas of quotas managed before the failure"""
+        self.module.fail_json(msg=msg, **self.result)
+
     def perform_module_operation(self):
         """
         Perform different actions on Smart Quota module based on parameters
         chosen in playbook
         """
-        quota_type = self.module.params['quota_type']
-        user_name = self.module.params['user_name']
-        group_name = self.module.params['group_name']
+        quotas = self.module.params['quotas']
+        if quotas is None:
+            changed, quota_details = self.manage_quota(self.module.params)
+            self.result["quota_details"] = quota_details
+        else:
+            # All the quotas of the list are managed with the same
+            # connection, one after the other. The result is kept up to
+            # date, so a failure reports the quotas already managed.
+            quotas_details = []
+            self.result["quotas_details"] = quotas_details
+            changed = False
+            for quota_params in quotas:
+                quota_changed, quota_details = self.manage_quota(
+                    quota_params)
+                changed = changed or quota_changed
+                self.result["changed"] = changed
+                quotas_details.append(quota_details)
+        self.result["changed"] = changed
+        self.module.exit_json(**self.result)
+
+    def manage_quota(self, params):
+        """
+        Bring a single Smart Quota to the state chosen in playbook
+        :param params: The parameters identifying and describing the quota.
+        :return: Whether the quota changed and its details.
+        """
+        quota_type = params['quota_type']
+        user_name = params['user_name']
+        group_name = params['group_name']
 
-        access_zone = self.module.params['access_zone']
+        access_zone = params['access_zone']
         if access_zone == "" or access_zone.isspace():
-            self.module.fail_json(msg="Invalid Access_zone provided,"
-                                      " Please a provide valid Access_zone")
+            self.fail_json(msg="Invalid Access_zone provided,"
+                               " Please a provide valid Access_zone")
 
-        provider_type = self.module.params['provider_type']
-        state = self.module.params['state']
+        provider_type = params['provider_type']
+        state = params['state']
 
-        quota = self.module.params['quota']
+        quota = params['quota']
         if quota:
             self.convert_quota_thresholds(quota)
             include_snapshots = quota.get('include_snapshots')
         else:
             include_snapshots = False
-        message = "Quota Dictionary after conversion:  %s" % str(quota)
-        LOG.debug(message)
+        LOG.debug("Quota Dictionary after conversion:  %s", quota)
+        has_limit = bool(quota and (quota['advisory'] or quota['soft'] or
+                                    quota['hard']))
 
-        path = self.module.params['path']
+        path = params['path']
         if path == "" or path.isspace():
-            self.module.fail_json(msg="Invalid path provided,"
-                                      " Please a provide valid path")
-        # If Access_Zone is System then absolute path is required
-        # else relative path is taken
-        if access_zone.lower() == "system":
-            complete_path = path
-        else:
-            complete_path = self.get_zone_base_path(access_zone) + path
+            self.fail_json(msg="Invalid path provided,"
+                               " Please a provide valid path")
 
-        changed = False
-        # Get the sid(security identifier) for User
-        sid = None
-        if quota_type == "user":
-            sid = self.get_sid(user_name, quota_type,
-                               provider_type, access_zone)
-        # Get the sid(security identifier) for Group
-        if quota_type == "group":
-            sid = self.get_sid(group_name, quota_type,
-                               provider_type, access_zone)
-
-        # Throw error if quota_type is directory
-        # and parameters for user and group are provided
+        # The parameters are all validated before any request is sent to
+        # the array. Throw error if quota_type is directory and parameters
+        # for user and group are provided
         if quota_type == 'directory':
             provider_type = None
             if user_name or group_name or provider_type:
-                self.module.fail_json(
+                self.fail_json(
                     msg="quota_type is directory given,"
                         " user_name/group_name/provider_type not required.")
 
         # Throw error if limits and cap_unit are not passed together
-        if quota and (quota['advisory'] or quota['soft'] or quota['hard']) \
-                and not quota['cap_unit']:
-            self.module.fail_json(msg="advisory/soft/hard limit provided,"
-                                      " cap_unit not provided")
-        if quota and quota['cap_unit'] \
-                and not(quota['advisory'] or quota['soft'] or quota['hard']):
-            self.module.fail_json(
+        if has_limit and not quota['cap_unit']:
+            self.fail_json(msg="advisory/soft/hard limit provided,"
+                               " cap_unit not provided")
+        if quota and quota['cap_unit'] and not has_limit:
+            self.fail_json(
                 msg="cap_unit provided,"
                     " advisory/soft/hard limit not provided")
 
+        # The user/group account is looked up while the access zone base
+        # path is fetched, the two requests do not depend on each other.
+        # Both go through the same api client, whose connection pool
+        # (utils.CONNECTION_POOL_MAXSIZE) keeps a connection for each
+        persona_name = {'user': user_name,
+                        'group': group_name}.get(quota_type)
+        sid_job = None
+        if persona_name:
+            sid_job = self.executor.submit(
+                self.lookup_sid, persona_name, quota_type, provider_type,
+                access_zone)
+
+        # If Access_Zone is System then absolute path is required
+        # else relative path is taken, joined to the base path with a
+        # single separator
+        if access_zone.lower() == "system":
+            complete_path = path
+        else:
+            complete_path = self.get_zone_base_path(access_zone).rstrip(
+                '/') + '/' + path.lstrip('/')
+
+        changed = False
+        # Get the sid(security identifier) for User/Group
+        sid = None
+        if sid_job:
+            sid = self.get_sid(persona_name, quota_type,
+                               provider_type, access_zone, sid_job)
+
         # Get the details of the Quota
         quota_details, quota_id = self.get_quota_details(
             include_snapshots, access_zone, quota_type, complete_path, sid)
@@ -636,21 +831,18 @@ class IsilonSmartQuota(object):
                 persona_obj = \
                     utils.isi_sdk.AuthAccessAccessItemFileGroup(id=sid)
             self.create(complete_path, quota_type, access_zone, quota,
-                        persona_obj)
+                        has_limit, persona_obj)
             changed = True
 
         # Update a Quota
+        # The update payload is only built when a modification is required,
+        # an idempotent run only reads from the array
         if state == "present" and quota_details and quota:
-            modify_flag = False
-            if quota:
-                modify_flag = to_modify_quota(
-                    quota, quota_details["thresholds"],
-                    quota_details["thresholds_include_overhead"])
-            enforce_limit = False
-            if quota_details["enforced"] or quota['advisory'] or \
-                    quota['hard'] or quota['soft']:
-                enforce_limit = True
+            modify_flag = to_modify_quota(
+                quota, quota_details.thresholds,
+                quota_details.thresholds_include_overhead)
             if modify_flag:
+                enforce_limit = quota_details.enforced or has_limit
                 LOG.info("Updating the Quota")
                 changed = self.update(quota, quota_id, enforce_limit, path)
 
@@ -659,16 +851,22 @@ class IsilonSmartQuota(object):
             LOG.info("Delete Quota")
             changed = self.delete(quota_id, complete_path)
 
-        quota_details, quota_id = self.get_quota_details(
-            include_snapshots, access_zone, quota_type, complete_path, sid)
+        # The details fetched above are still current when nothing changed
+        # and a deleted quota has none, otherwise the quota is fetched again
+        # to pick up the values computed by the array
+        if state == "absent":
+            quota_details = None
+        elif changed:
+            quota_details, quota_id = self.get_quota_details(
+                include_snapshots, access_zone, quota_type, complete_path,
+                sid)
+        if quota_details:
+            quota_details = quota_details.to_dict()
         if quota_type != "directory" and quota_details:
             quota_details['persona']['type'] = quota_type
             quota_details['persona']['name'] = \
                 user_name if user_name else group_name
-        quota_details = add_limits_with_unit(quota_details)
-        self.result["changed"] = changed
-        self.result["quota_details"] = quota_details
-        self.module.exit_json(**self.result)
+        return changed, add_limits_with_unit(quota_details)
 
 
 def add_limits_with_unit(quota_details):
@@ -679,13 +877,12 @@ def add_limits_with_unit(quota_details):
     """
     if quota_details is None:
         return None
-    limit_list = ['hard', 'soft', 'advisory']
-    for limit in limit_list:
-        if quota_details['thresholds'][limit]:
-            size_with_unit = utils.convert_size_with_unit(
-                quota_details['thresholds'][limit]).split(" ")
-            new_limit = limit + "("+size_with_unit[1]+")"
-            quota_details['thresholds'][new_limit] = size_with_unit[0]
+    thresholds = quota_details['thresholds']
+    for limit in ('hard', 'soft', 'advisory'):
+        if thresholds[limit]:
+            size, unit = utils.convert_size_with_unit(
+                thresholds[limit]).rsplit(' ', 1)
+            thresholds['{0}({1})'.format(limit, unit)] = size
     return quota_details
 
 
@@ -693,37 +890,52 @@ def to_modify_quota(input_quota, array_quota, array_include_overhead):
     """
 
     :param input_quota: Threshold limits dictionary passed by the user.
-    :param array_quota: Threshold limits dictionary got from the Isilon Array
+    :param array_quota: Threshold limits object got from the Isilon Array
     :param array_include_overhead: Whether Quota Include Overheads or not.
     :return: True if the quota is to be modified else returns False.
     """
     if input_quota['include_overheads'] is not None \
             and input_quota['include_overheads'] != array_include_overhead:
         return True
-    for limit in input_quota:
-        if limit in array_quota and input_quota[limit] is not None and\
-                input_quota[limit] != array_quota[limit]:
+    for limit in THRESHOLD_KEYS:
+        if input_quota[limit] is not None and \
+                input_quota[limit] != getattr(array_quota, limit):
             return True
     return False
 
 
-def determine_error(error_obj):
-    """Determine the error message to return"""
-    if isinstance(error_obj, utils.ApiException):
-        error = re.sub("[\n \"]+", ' ', str(error_obj.body))
-    else:
-        error = str(error_obj)
-    return error
-
-
 def period_to_seconds(period, period_unit):
     """ Convert the given period to seconds"""
-    if period_unit == 'days':
-        return period * 86400
-    if period_unit == 'weeks':
-        return period * 7 * 86400
-    if period_unit == 'months':
-        return period * 30 * 86400
+    return period * PERIOD_UNIT_IN_SECONDS[period_unit]
+
+
+def get_quota_create_params(path, quota_type, quota_dict, has_limit,
+                            persona=None):
+    """
+    Get the create parameters of a quota with threshold limits.
+    :param path: The path for which quota has to be created.
+    :param quota_type: The type of the quota.
+    :param quota_dict: Threshold limits dictionary containing all limits.
+    :param has_limit: Whether any advisory/soft/hard limit is provided.
+    :param persona: User/Group object.
+    :return: Quota create parameters object.
+    """
+    threshold_obj = utils.isi_sdk.QuotaQuotaThresholds(
+        quota_dict['advisory'], hard=quota_dict['hard'],
+        soft=quota_dict['soft'],
+        soft_grace=quota_dict['soft_grace'])
+
+    # if not passed during creation of Quota
+    # Set include_overheads as False
+    include_overhead = quota_dict['include_overheads'] or False
+    include_snapshots = quota_dict['include_snapshots'] or False
+
+    return utils.isi_sdk.QuotaQuotaCreateParams(
+        include_snapshots=include_snapshots, path=path,
+        enforced=has_limit,
+        persona=persona,
+        thresholds_include_overhead=include_overhead,
+        thresholds=threshold_obj, type=quota_type)
 
 
 def make_threshold_obj(advisory, soft, soft_grace, hard):
@@ -736,15 +948,28 @@ def make_threshold_obj(advisory, soft, soft_grace, hard):
 def get_isilon_smartquota_parameters():
     """This method provides parameters required for the ansible Smart Quota
     module on Isilon"""
+    params = get_quota_parameters()
+    quota_options = get_quota_parameters()
+    for option in ('path', 'quota_type', 'state'):
+        quota_options[option]['required'] = True
+    params['quotas'] = dict(type='list', elements='dict',
+                            options=quota_options,
+                            mutually_exclusive=[['group_name', 'user_name']],
+                            required_if=PERSONA_REQUIRED_IF)
+    return params
+
+
+def get_quota_parameters():
+    """This method provides parameters identifying and describing a single
+    Smart Quota"""
     return dict(
-        path=dict(required=True, type='str'),
+        path=dict(type='str'),
         user_name=dict(type='str'),
         group_name=dict(type='str'),
         access_zone=dict(type='str', default='system'),
         provider_type=dict(type='str', default='local',
-                           choices=['local', 'file', 'ldap', 'ads']),
-        quota_type=dict(required=True, type='str',
-                        choices=['user', 'group', 'directory']),
+                           choices=('local', 'file', 'ldap', 'ads')),
+        quota_type=dict(type='str', choices=('user', 'group', 'directory')),
         quota=dict(
             type='dict', options=dict(
                 include_snapshots=dict(type='bool', default=False),
@@ -754,18 +979,24 @@ def get_isilon_smartquota_parameters():
                 hard_limit_size=dict(type='int'),
                 soft_grace_period=dict(type='int'),
                 period_unit=dict(type='str',
-                                 choices=['days', 'weeks', 'months']),
-                cap_unit=dict(type='str', choices=['GB', 'TB'])
+                                 choices=('days', 'weeks', 'months')),
+                cap_unit=dict(type='str', choices=('GB', 'TB'))
             ),
             required_together=[
                 ['soft_grace_period', 'period_unit'],
                 ['soft_grace_period', 'soft_limit_size']
             ]
         ),
-        state=dict(required=True, type='str', choices=['present', 'absent'])
+        state=dict(type='str', choices=('present', 'absent'))
     )
 
 
+# Argument spec of the module, the parameters are constant and so the spec
+# is built once when the module is loaded
+ARGUMENT_SPEC = utils.get_isilon_management_host_parameters()
+ARGUMENT_SPEC.update(get_isilon_smartquota_parameters())
+
+
 def main():
     """ Create Isilon Smart Quota object and perform actions on it
         based on user input from playbook"""
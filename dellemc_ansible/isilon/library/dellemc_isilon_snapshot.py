@@ -247,20 +247,27 @@ snapshot_details:
 '''
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.storage.dell \
     import dellemc_ansible_isilon_utils as utils
-from datetime import datetime, timedelta
+from datetime import datetime
 import calendar
 import time
-import dateutil.relativedelta
-import re
 
 LOG = utils.get_logger('dellemc_isilon_snapshot',
                        log_devel=logging.INFO)
 
-HAS_ISILON_SDK = utils.has_isilon_sdk()
-ISILON_SDK_VERSION_CHECK = utils.isilon_sdk_version_check()
+# Base paths of the access zones already looked up, keyed by OneFS host and
+# access zone name, so a zone is only fetched once per process
+ZONE_BASE_PATHS = {}
+
+# Seconds in each retention unit, a retention without a unit is in hours
+RETENTION_UNIT_SECONDS = {None: 3600, 'hours': 3600, 'days': 86400}
+
+# Epoch times of the expiration timestamps already converted, keyed by the
+# UTC timestamp given in the playbook
+EXPIRATION_EPOCHS = {}
 
 
 class IsilonSnapshot(object):
@@ -269,31 +276,29 @@ class IsilonSnapshot(object):
     def __init__(self):
         """Define all the parameters required by this module"""
 
-        self.module_params = utils \
-            .get_isilon_management_host_parameters()
-        self.module_params.update(get_isilon_snapshot_parameters())
-
         mutually_exclusive = [
             ['desired_retention', 'expiration_timestamp'],
             ['expiration_timestamp', 'retention_unit']
         ]
 
         # initialize the Ansible module
-        self.module = AnsibleModule(argument_spec=self.module_params,
+        self.module = AnsibleModule(argument_spec=ARGUMENT_SPEC,
                                     supports_check_mode=False,
                                     mutually_exclusive=mutually_exclusive
                                     )
 
-        if HAS_ISILON_SDK is False:
+        # The SDK is only probed once the playbook arguments are valid
+        if utils.has_isilon_sdk() is False:
             self.module.fail_json(msg='Ansible modules for Isilon '
                                       'require the Isilon python library'
                                       ' to be installed. Please install'
                                       ' the library before using these '
                                       'modules.')
 
-        if ISILON_SDK_VERSION_CHECK and \
-                not ISILON_SDK_VERSION_CHECK['supported_version']:
-            err_msg = ISILON_SDK_VERSION_CHECK['unsupported_version_message']
+        isilon_sdk_version_check = utils.isilon_sdk_version_check()
+        if isilon_sdk_version_check and \
+                not isilon_sdk_version_check['supported_version']:
+            err_msg = isilon_sdk_version_check['unsupported_version_message']
             LOG.error(err_msg)
             self.module.fail_json(msg=err_msg)
 
@@ -301,17 +306,34 @@ class IsilonSnapshot(object):
         self.isi_sdk = utils.get_isilon_sdk()
         LOG.info('Got python SDK instance for provisioning on Isilon ')
         self.snapshot_api = self.isi_sdk.SnapshotApi(self.api_client)
-        self.zone_summary_api = self.isi_sdk.ZonesSummaryApi(self.api_client)
-
-    def determine_path(self):
-        path = None
-        if self.module.params['path']:
-            path = self.module.params['path']
-        access_zone = self.module.params['access_zone']
+        # The zones summary api is only needed for non-System access zones,
+        # so it is created on first use
+        self._zone_summary_api = None
+        # Alias names keyed by the name of their target snapshot, listed
+        # once on the first alias lookup
+        self.alias_index = None
+
+        # The snapshot and its aliases are fetched on workers while the
+        # playbook parameters are validated. fail_json must not be called
+        # from the worker threads, so they only make the SDK calls and their
+        # errors are raised on the main thread.
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.alias_job = None
+
+    @property
+    def zone_summary_api(self):
+        """Zones summary api of the SDK"""
+        if self._zone_summary_api is None:
+            self._zone_summary_api = self.isi_sdk.ZonesSummaryApi(
+                self.api_client)
+        return self._zone_summary_api
+
+    def determine_path(self, path, access_zone):
+        if not path:
+            return None
 
         if access_zone.lower() != 'system':
-            if path:
-                path = self.get_zone_base_path(access_zone) + path
+            path = self.get_zone_base_path(access_zone) + path
 
         return path
 
@@ -327,26 +349,29 @@ class IsilonSnapshot(object):
                                       " as the desired retention.")
 
     def validate_expiration_timestamp(self, expiration_timestamp):
-        """Validates whether the expiration timestamp is valid"""
+        """Validates whether the expiration timestamp is valid and returns
+        it parsed"""
         try:
-            datetime.strptime(expiration_timestamp,
-                              '%Y-%m-%dT%H:%M:%SZ')
+            return datetime.strptime(expiration_timestamp,
+                                     '%Y-%m-%dT%H:%M:%SZ')
         except ValueError:
             self.module.fail_json(msg='Incorrect date format, '
                                       'should be YYYY-MM-DDTHH:MM:SSZ')
 
-    def get_filesystem_snapshot_details(self, snapshot_name):
-        """Returns details of a filesystem Snapshot"""
+    def get_filesystem_snapshot_details(self, snapshot_name,
+                                        snapshot_job=None):
+        """Returns details of a filesystem Snapshot, from the given job if
+        it has already been requested"""
         try:
+            if snapshot_job is not None:
+                return snapshot_job.result()
             return self.snapshot_api.get_snapshot_snapshot(snapshot_name)
         except utils.ApiException as e:
-            if str(e.status) == "404":
-                log_msg = "Snapshot {0} status is " \
-                          "{1}".format(snapshot_name, e.status)
-                LOG.info(log_msg)
+            if e.status == 404:
+                LOG.info("Snapshot %s status is %s", snapshot_name, e.status)
                 return None
             else:
-                error_msg = self.determine_error(error_obj=e)
+                error_msg = utils.determine_error(e)
                 error_message = "Failed to get details of Snapshot " \
                                 "{0} with error {1} ".format(
                                     snapshot_name,
@@ -362,12 +387,16 @@ class IsilonSnapshot(object):
 
     def get_zone_base_path(self, access_zone):
         """Returns the base path of the Access Zone."""
+        key = (self.module.params['onefs_host'], access_zone)
+        if key in ZONE_BASE_PATHS:
+            return ZONE_BASE_PATHS[key]
         try:
             zone_path = (self.zone_summary_api.
                          get_zones_summary_zone(access_zone)).to_dict()
-            return zone_path['summary']['path']
+            ZONE_BASE_PATHS[key] = zone_path['summary']['path']
+            return ZONE_BASE_PATHS[key]
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Unable to fetch base path of Access Zone {0} ' \
                             ',failed with error: {1}'.format(access_zone,
                                                              str(error_msg))
@@ -396,32 +425,13 @@ class IsilonSnapshot(object):
                                       "creating a new snapshot.".format(
                                           snapshot_name))
 
-        if not self.module.params['path']:
+        if not path:
             self.module.fail_json(msg="Please provide a valid path for "
                                       "snapshot creation")
 
         if desired_retention and desired_retention.lower() != 'none':
-            if retention_unit is None:
-                expiration_timestamp = (datetime.utcnow() +
-                                        timedelta(
-                                            hours=int(desired_retention))
-                                        )
-                epoch_expiry_time = calendar.timegm(
-                    time.strptime(str(expiration_timestamp),
-                                  '%Y-%m-%d %H:%M:%S.%f'))
-
-            elif retention_unit == 'days':
-                expiration_timestamp = (datetime.utcnow() + timedelta(
-                    days=int(desired_retention)))
-                epoch_expiry_time = calendar.timegm(
-                    time.strptime(str(expiration_timestamp),
-                                  '%Y-%m-%d %H:%M:%S.%f'))
-            elif retention_unit == 'hours':
-                expiration_timestamp = (datetime.utcnow() + timedelta(
-                    hours=int(desired_retention)))
-                epoch_expiry_time = calendar.timegm(
-                    time.strptime(str(expiration_timestamp),
-                                  '%Y-%m-%d %H:%M:%S.%f'))
+            epoch_expiry_time = int(time.time()) + int(desired_retention) * \
+                RETENTION_UNIT_SECONDS[retention_unit]
 
         elif desired_retention and \
                 desired_retention.lower() == 'none':
@@ -437,7 +447,7 @@ class IsilonSnapshot(object):
                 snapshot_create_param)
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to create snapshot: {0} for ' \
                             'filesystem {1} with error: ' \
                             '{2}'.format(snapshot_name, path, str(error_msg))
@@ -450,7 +460,7 @@ class IsilonSnapshot(object):
             self.snapshot_api.delete_snapshot_snapshot(snapshot_name)
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to delete ' \
                             'snapshot: {0} with ' \
                             'error: {1}'.format(snapshot_name, str(error_msg))
@@ -462,23 +472,21 @@ class IsilonSnapshot(object):
         if snapshot is None:
             self.module.fail_json(msg="Snapshot not found.")
 
-        snapshot = snapshot.to_dict()
+        snapshot_name = snapshot.snapshots[0].name
 
-        if snapshot['snapshots'][0]['name'] == new_name:
+        if snapshot_name == new_name:
             return False
         try:
             snapshot_update_param = self.isi_sdk.SnapshotSnapshot(
                 name=new_name)
             self.snapshot_api.update_snapshot_snapshot(
-                snapshot_update_param,
-                snapshot['snapshots'][0]['name'])
+                snapshot_update_param, snapshot_name)
             return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to rename snapshot: {0} ' \
                             'with error: ' \
-                            '{1}'.format(snapshot['snapshots'][0]['name'],
-                                         str(error_msg))
+                            '{1}'.format(snapshot_name, str(error_msg))
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
@@ -496,11 +504,12 @@ class IsilonSnapshot(object):
         snapshot_modification_details['is_timestamp_modified'] = False
         snapshot_modification_details['new_expiration_timestamp_value'] = None
 
-        snap_details = snapshot.to_dict()
+        # Only a few fields of the snapshot are read, so they are taken from
+        # the SDK model rather than from a copy made by to_dict
+        snap_details = snapshot.snapshots[0]
 
         if effective_path is not None:
-            if self.module.params['path'] and \
-                    snap_details['snapshots'][0]['path'] != effective_path:
+            if snap_details.path != effective_path:
                 error_message = 'The path {0} specified in the playbook does '\
                                 'not match the path of the snapshot {1} '\
                                 'on the array'.format(effective_path,
@@ -515,12 +524,8 @@ class IsilonSnapshot(object):
                      "in this case. The snapshot details would be returned, "
                      "if available.")
             return False, snapshot_modification_details
-        info_message = "The snap details are: {0}".format(snap_details)
-        LOG.info(info_message)
-        snap_creation_timestamp = None
-        if 'created' in snap_details['snapshots'][0]:
-            snap_creation_timestamp = \
-                snap_details['snapshots'][0]['created']
+        LOG.info("The snap details are: %s", snap_details)
+        snap_creation_timestamp = snap_details.created
 
         # Here we are calculating the desired retention.
         # If the retention unit is not specified, default is hours.
@@ -528,111 +533,40 @@ class IsilonSnapshot(object):
         # creation timestamp of the snapshot to the desired retention
         # specified in the Playbook.
         if desired_retention and desired_retention.lower() != 'none':
-            if retention_unit is None:
-                expiration_timestamp = \
-                    datetime.fromtimestamp(snap_creation_timestamp) + \
-                    timedelta(hours=int(desired_retention))
-                expiration_timestamp = \
-                    time.mktime(expiration_timestamp.timetuple())
-
-            elif retention_unit == 'days':
-                expiration_timestamp = \
-                    datetime.fromtimestamp(snap_creation_timestamp) + \
-                    timedelta(days=int(desired_retention))
-                expiration_timestamp = \
-                    time.mktime(expiration_timestamp.timetuple())
-            elif retention_unit == 'hours':
-                expiration_timestamp = \
-                    datetime.fromtimestamp(snap_creation_timestamp) + \
-                    timedelta(hours=int(desired_retention))
-                expiration_timestamp = \
-                    time.mktime(expiration_timestamp.timetuple())
+            expiration_timestamp = snap_creation_timestamp + \
+                int(desired_retention) * RETENTION_UNIT_SECONDS[retention_unit]
         elif desired_retention and desired_retention.lower() == 'none':
             expiration_timestamp = None
-        info_message = "The new expiration " \
-                       "timestamp is {0}".format(expiration_timestamp)
-        LOG.info(info_message)
+        LOG.info("The new expiration timestamp is %s", expiration_timestamp)
 
         modified = False
-        if 'expires' in snap_details['snapshots'][0] and \
-                snap_details['snapshots'][0]['expires'] is not None \
-                and expiration_timestamp is not None:
-            if snap_details['snapshots'][0]['expires'] \
-                    != expiration_timestamp:
-                # We can tolerate a delta of two minutes.
-                existing_timestamp = \
-                    snap_details['snapshots'][0]['expires']
-                new_timestamp = expiration_timestamp
-                info_message = 'The existing timestamp is: ' \
-                               '{0} and the new timestamp ' \
-                               'is: {1}'.format(existing_timestamp,
-                                                new_timestamp)
-                LOG.info(info_message)
-
-                existing_time_obj = datetime.fromtimestamp(
-                    existing_timestamp)
-                new_time_obj = datetime.fromtimestamp(
-                    new_timestamp)
-
-                if existing_time_obj > new_time_obj:
-                    td = dateutil.relativedelta.relativedelta(
-                        existing_time_obj, new_time_obj)
-                else:
-                    td = dateutil.relativedelta.relativedelta(
-                        new_time_obj, existing_time_obj)
-                info_message = 'The time difference is ' \
-                               '{0} minutes'.format(td.minutes)
-                LOG.info(info_message)
-                # A delta of two minutes is treated as idempotent
-                if td.seconds > 120 or td.minutes > 2 or \
-                        td.hours > 0 or td.days > 0 or td.years > 0:
-                    snapshot_modification_details[
-                        'is_timestamp_modified'] = True
-                    snapshot_modification_details[
-                        'new_expiration_timestamp_value'] = \
-                        expiration_timestamp
-                    modified = True
-        # This is the case when expiration timestamp may not be present
-        # in the snapshot details.
-        # Expiration timestamp specified in the playbook is not None.
-        elif 'expires' not in snap_details['snapshots'][0] \
-                and expiration_timestamp is not None:
-            snapshot_modification_details['is_timestamp_modified'] = True
-            snapshot_modification_details[
-                'new_expiration_timestamp_value'] = expiration_timestamp
-            modified = True
-        elif 'expires' in snap_details['snapshots'][0] \
-                and desired_retention and desired_retention.lower() == 'none' \
-                and expiration_timestamp is None:
-            # Ensure only when desired retention is explicitly set to 'None'
-            # we try to modify.
-            if snap_details['snapshots'][
-                    0]['expires'] is not None:
+        existing_timestamp = snap_details.expires
+        # The expiration timestamp is only removed when desired retention
+        # is explicitly set to 'None'
+        if expiration_timestamp is not None or \
+                (desired_retention and desired_retention.lower() == 'none'):
+            LOG.info("The existing timestamp is: %s and the new "
+                     "timestamp is: %s", existing_timestamp,
+                     expiration_timestamp)
+            # A delta of two minutes is treated as idempotent
+            if (existing_timestamp is None) != \
+                    (expiration_timestamp is None) or \
+                    (expiration_timestamp is not None and
+                     abs(int(existing_timestamp) -
+                         int(expiration_timestamp)) > 120):
                 snapshot_modification_details['is_timestamp_modified'] = True
                 snapshot_modification_details[
                     'new_expiration_timestamp_value'] = expiration_timestamp
                 modified = True
-        elif 'expires' in snap_details['snapshots'][0] and \
-                snap_details['snapshots'][0]['expires'] is \
-                None and expiration_timestamp is not None:
-            snapshot_modification_details['is_timestamp_modified'] = True
-            snapshot_modification_details[
-                'new_expiration_timestamp_value'] = expiration_timestamp
-            modified = True
-
-        snapshot_alias = self.get_snapshot_alias(snapshot_name)
 
-        if snapshot_alias != alias:
+        # The aliases are only listed when an alias is given in the playbook
+        if alias is not None and \
+                self.get_snapshot_alias(snapshot_name) != alias:
             snapshot_modification_details['is_alias_modified'] = True
             snapshot_modification_details['new_alias_value'] = alias
             modified = True
-        info_message = "Snapshot " \
-                       "modified {0}, " \
-                       "modification " \
-                       "details: {1}".format(
-                           modified,
-                           snapshot_modification_details)
-        LOG.info(info_message)
+        LOG.info("Snapshot modified %s, modification details: %s",
+                 modified, snapshot_modification_details)
 
         return modified, snapshot_modification_details
 
@@ -640,27 +574,25 @@ class IsilonSnapshot(object):
                                    snapshot_modification_details):
         """Modify a filesystem snapshot"""
         try:
-            changed = False
+            # The expiry and the alias are updated in a single request
+            snapshot_update = dict()
             if snapshot_modification_details['is_timestamp_modified']:
                 new_timestamp = \
                     snapshot_modification_details[
                         'new_expiration_timestamp_value']
-                snapshot_update_param = self.isi_sdk.SnapshotSnapshot(
-                    expires=int(new_timestamp))
-                self.snapshot_api.update_snapshot_snapshot(
-                    snapshot_update_param, snapshot_name)
-                changed = True
+                snapshot_update['expires'] = int(new_timestamp)
             if snapshot_modification_details['is_alias_modified']:
-                new_alias = \
+                snapshot_update['alias'] = \
                     snapshot_modification_details['new_alias_value']
-                snapshot_update_param = self.isi_sdk.SnapshotSnapshot(
-                    alias=new_alias)
-                self.snapshot_api.update_snapshot_snapshot(
-                    snapshot_update_param, snapshot_name)
-                changed = True
-            return changed
+            if not snapshot_update:
+                return False
+            snapshot_update_param = self.isi_sdk.SnapshotSnapshot(
+                **snapshot_update)
+            self.snapshot_api.update_snapshot_snapshot(
+                snapshot_update_param, snapshot_name)
+            return True
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to modify snapshot ' \
                             '{0} with error {1}'.format(snapshot_name,
                                                         str(error_msg))
@@ -669,21 +601,26 @@ class IsilonSnapshot(object):
 
     def get_snapshot_alias(self, snapshot_name):
         """Returns the alias for a given snapshot"""
+        if self.alias_index is not None:
+            return self.alias_index.get(snapshot_name)
         try:
-            alias_name = None
             # We get a list of all aliases
             # If any alias has a target which matches the snapshot name
             # It indicates it is the alias of that snapshot
-            snap_list = \
-                self.snapshot_api.list_snapshot_snapshots(
-                    type='alias').to_dict()
+            if self.alias_job is not None:
+                snap_list = self.alias_job.result().to_dict()
+            else:
+                snap_list = \
+                    self.snapshot_api.list_snapshot_snapshots(
+                        type='alias').to_dict()
+            alias_index = dict()
             for snap in snap_list['snapshots']:
-                if snap['target_name'] == snapshot_name:
-                    alias_name = snap['name']
-                    break
-            return alias_name
+                # The first alias listed for a target is kept
+                alias_index.setdefault(snap['target_name'], snap['name'])
+            self.alias_index = alias_index
+            return self.alias_index.get(snapshot_name)
         except Exception as e:
-            error_msg = self.determine_error(error_obj=e)
+            error_msg = utils.determine_error(e)
             error_message = 'Failed to get alias for ' \
                             'snapshot {0} with error {1}'.format(
                                 snapshot_name,
@@ -691,20 +628,15 @@ class IsilonSnapshot(object):
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
-    def determine_error(self, error_obj):
-        """Determine the error message to return"""
-        if isinstance(error_obj, utils.ApiException):
-            error = re.sub("[\n \"]+", ' ', str(error_obj.body))
-        else:
-            error = str(error_obj)
-        return error
-
     def convert_utc_to_epoch(self, expiration_timestamp):
-        """Convert UTC to Epoch time"""
-        timestamp = datetime.strptime(expiration_timestamp,
-                                      '%Y-%m-%dT%H:%M:%SZ')
-        epoch = calendar.timegm(timestamp.utctimetuple())
-        return epoch
+        """Validate and convert UTC to Epoch time"""
+        # Only valid timestamps are remembered, so they are parsed once
+        if expiration_timestamp not in EXPIRATION_EPOCHS:
+            timestamp = self.validate_expiration_timestamp(
+                expiration_timestamp)
+            EXPIRATION_EPOCHS[expiration_timestamp] = calendar.timegm(
+                timestamp.utctimetuple())
+        return EXPIRATION_EPOCHS[expiration_timestamp]
 
     def perform_module_operation(self):
         """
@@ -712,15 +644,16 @@ class IsilonSnapshot(object):
         parameter chosen in playbook
         """
 
-        snapshot_name = self.module.params['snapshot_name']
-        path = self.module.params['path']
-        access_zone = self.module.params['access_zone']
-        new_snapshot_name = self.module.params['new_snapshot_name']
-        expiration_timestamp = self.module.params['expiration_timestamp']
-        desired_retention = self.module.params['desired_retention']
-        retention_unit = self.module.params['retention_unit']
-        alias = self.module.params['alias']
-        state = self.module.params['state']
+        params = self.module.params
+        snapshot_name = params['snapshot_name']
+        path = params['path']
+        access_zone = params['access_zone']
+        new_snapshot_name = params['new_snapshot_name']
+        expiration_timestamp = params['expiration_timestamp']
+        desired_retention = params['desired_retention']
+        retention_unit = params['retention_unit']
+        alias = params['alias']
+        state = params['state']
 
         result = dict(
             changed=False
@@ -731,7 +664,16 @@ class IsilonSnapshot(object):
             LOG.error(error_message)
             self.module.fail_json(msg=error_message)
 
-        effective_path = self.determine_path()
+        # The snapshot, and the aliases when an alias is given in the
+        # playbook, are fetched while the parameters are validated and the
+        # access zone base path is looked up
+        snapshot_job = self.executor.submit(
+            self.snapshot_api.get_snapshot_snapshot, snapshot_name)
+        if alias is not None:
+            self.alias_job = self.executor.submit(
+                self.snapshot_api.list_snapshot_snapshots, type='alias')
+
+        effective_path = self.determine_path(path, access_zone)
 
         if desired_retention is not None:
             self.validate_desired_retention(desired_retention)
@@ -743,11 +685,11 @@ class IsilonSnapshot(object):
             self.module.fail_json(msg=error_message)
 
         if expiration_timestamp is not None:
-            self.validate_expiration_timestamp(expiration_timestamp)
             expiration_timestamp = self.convert_utc_to_epoch(
                 expiration_timestamp)
 
-        snapshot = self.get_filesystem_snapshot_details(snapshot_name)
+        snapshot = self.get_filesystem_snapshot_details(snapshot_name,
+                                                        snapshot_job)
 
         is_snap_modified = False
         snapshot_modification_details = dict()
@@ -761,52 +703,48 @@ class IsilonSnapshot(object):
                                              snapshot_name,
                                              effective_path)
 
-        if state == 'present' and not snapshot:
-            info_message = "Creating new snapshot: " \
-                           "{0} for filesystem: {1}".format(snapshot_name,
-                                                            effective_path)
-            LOG.info(info_message)
-            result['changed'] = \
-                self.create_filesystem_snapshot(snapshot_name,
-                                                alias,
-                                                effective_path,
-                                                desired_retention,
-                                                retention_unit,
-                                                expiration_timestamp,
-                                                new_snapshot_name
-                                                ) or result['changed']
-
-        if state == 'present' and new_snapshot_name:
-            info_message = "Renaming snapshot {0} to new name {1}".format(
-                snapshot_name, new_snapshot_name)
-            LOG.info(info_message)
-            result['changed'] = self.rename_filesystem_snapshot(
-                snapshot, new_snapshot_name) or result['changed']
-            snapshot_name = new_snapshot_name
-
-        if state == 'absent' and snapshot:
-            info_message = "Deleting snapshot {0}".format(
-                snapshot_name)
-            LOG.info(info_message)
-            result['changed'] = \
-                self.delete_filesystem_snapshot(snapshot_name) \
-                or result['changed']
-
-        if state == 'present' and is_snap_modified:
-            info_message = "Modifying snapshot {0}".format(snapshot_name)
-            LOG.info(info_message)
-            result['changed'] = \
-                self.modify_filesystem_snapshot(
-                    snapshot_name,
-                    snapshot_modification_details) \
-                or result['changed']
-
-        if state == 'present':
-            info_message = 'Getting snapshot: ' \
-                           '{0} details'.format(snapshot_name)
-            LOG.info(info_message)
-            result['snapshot_details'] = \
-                self.get_filesystem_snapshot_details(snapshot_name).to_dict()
+        # A snapshot that should be absent is only deleted. A snapshot that
+        # should be present is created, renamed and modified in this order.
+        if state == 'absent':
+            if snapshot:
+                LOG.info("Deleting snapshot %s", snapshot_name)
+                result['changed'] = \
+                    self.delete_filesystem_snapshot(snapshot_name)
+        else:
+            if not snapshot:
+                LOG.info("Creating new snapshot: %s for filesystem: %s",
+                         snapshot_name, effective_path)
+                result['changed'] = \
+                    self.create_filesystem_snapshot(snapshot_name,
+                                                    alias,
+                                                    effective_path,
+                                                    desired_retention,
+                                                    retention_unit,
+                                                    expiration_timestamp,
+                                                    new_snapshot_name)
+            else:
+                # Only an existing snapshot is renamed and modified, a
+                # created one already has the requested expiry and alias
+                if new_snapshot_name:
+                    LOG.info("Renaming snapshot %s to new name %s",
+                             snapshot_name, new_snapshot_name)
+                    result['changed'] = self.rename_filesystem_snapshot(
+                        snapshot, new_snapshot_name)
+                    snapshot_name = new_snapshot_name
+
+                if is_snap_modified:
+                    LOG.info("Modifying snapshot %s", snapshot_name)
+                    result['changed'] = \
+                        self.modify_filesystem_snapshot(
+                            snapshot_name,
+                            snapshot_modification_details) \
+                        or result['changed']
+
+            # The snapshot fetched first is returned unless it was changed
+            if result['changed']:
+                LOG.info("Getting snapshot: %s details", snapshot_name)
+                snapshot = self.get_filesystem_snapshot_details(snapshot_name)
+            result['snapshot_details'] = snapshot.to_dict()
 
         # Finally update the module result!
         self.module.exit_json(**result)
@@ -828,6 +766,12 @@ def get_isilon_snapshot_parameters():
     )
 
 
+# Argument spec of the module, the parameters are constant and so the spec
+# is built once when the module is loaded
+ARGUMENT_SPEC = utils.get_isilon_management_host_parameters()
+ARGUMENT_SPEC.update(get_isilon_snapshot_parameters())
+
+
 def main():
     """Create Isilon Snapshot object and perform action on it
         based on user input from playbook"""
@@ -9,20 +9,8 @@ except ImportError:
     HAS_ISILON_SDK = False
 
 
-'''import pkg_resources'''
-try:
-    from pkg_resources import parse_version
-    import pkg_resources
-    PKG_RSRC_IMPORTED = True
-except ImportError:
-    PKG_RSRC_IMPORTED = False
-
-
 import logging
-import math
 import urllib3
-urllib3.disable_warnings()
-from decimal import Decimal
 
 
 ''' Check and Get required libraries '''
@@ -37,25 +25,52 @@ def get_isilon_sdk():
 
 
 '''
-Check if required Isilon SDK version is installed
+Check if required Isilon SDK version is installed. The installed version
+does not change while a module runs, so it is checked only once and the
+result is returned to every later caller.
 '''
+ISILON_SDK_VERSION_CHECK = None
 
 
 def isilon_sdk_version_check():
+    global ISILON_SDK_VERSION_CHECK
+    if ISILON_SDK_VERSION_CHECK is None:
+        ISILON_SDK_VERSION_CHECK = check_isilon_sdk_version()
+    return ISILON_SDK_VERSION_CHECK
+
+
+def check_isilon_sdk_version():
     try:
         supported_version = False
-        if not PKG_RSRC_IMPORTED:
+        curr_version = None
+        # importlib.metadata only reads the metadata of the SDK. pkg_resources
+        # scans every installed distribution when imported, so it is only
+        # imported where importlib.metadata or packaging is not available.
+        try:
+            from importlib.metadata import version
+            from packaging.version import parse as parse_version
+            curr_version = version("isi-sdk-8-1-1")
+        except ImportError:
+            try:
+                import pkg_resources
+                parse_version = pkg_resources.parse_version
+                curr_version = \
+                    pkg_resources.require("isi-sdk-8-1-1")[0].version
+            except ImportError:
+                pass
+
+        if curr_version is None:
             unsupported_version_message = "Unable to import " \
-                                          "'pkg_resources', please install" \
-                                          " the required package"
+                                          "'packaging' or 'pkg_resources'," \
+                                          " please install the required " \
+                                          "package"
         else:
             min_ver = '0.2.7'
-            curr_version = pkg_resources.require("isi-sdk-8-1-1")[0].version
             unsupported_version_message =\
                 "isilon sdk {0} is not supported by this module. Minimum " \
                 "supported version is : {1} ".format(curr_version, min_ver)
-            supported_version = parse_version(curr_version) >= parse_version(
-                min_ver)
+            supported_version = parse_version(
+                curr_version) >= parse_version(min_ver)
 
         isi_sdk_version = dict(
             supported_version=supported_version,
@@ -105,6 +120,34 @@ def get_isilon_management_host_parameters():
     )
 
 
+'''
+Maximum number of connections kept alive to the OneFS host by an api
+client. All the SDK api instances created from one api client share them.
+'''
+CONNECTION_POOL_MAXSIZE = 8
+
+'''
+Retry policy of the connections to OneFS. urllib3 only retries requests
+that never reached OneFS or that are idempotent, so a create request is
+never sent twice.
+'''
+CONNECTION_RETRIES = urllib3.Retry(total=2, backoff_factor=0.2)
+
+
+'''
+Silence the warnings urllib3 issues for requests whose certificate is not
+verified. The warnings filter is only added once per process.
+'''
+INSECURE_REQUEST_WARNINGS_DISABLED = False
+
+
+def disable_insecure_request_warnings():
+    global INSECURE_REQUEST_WARNINGS_DISABLED
+    if not INSECURE_REQUEST_WARNINGS_DISABLED:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        INSECURE_REQUEST_WARNINGS_DISABLED = True
+
+
 '''
 This method is to establish connection to Isilon
 using its SDK.
@@ -116,11 +159,15 @@ parameters:
      - port_no: The port no of the OneFS host.
      - username:  Username to access OneFS
      - password: Password to access OneFS
-returns configuration object 
+  pool_maxsize - Maximum number of connections kept alive to OneFS, modules
+                 issuing more concurrent requests than the default can raise it
+returns api client object, which keeps its connections to OneFS alive,
+retries them as per CONNECTION_RETRIES and asks for gzip encoded responses
 '''
 
 
-def get_isilon_connection(module_params):
+def get_isilon_connection(module_params,
+                          pool_maxsize=CONNECTION_POOL_MAXSIZE):
     if HAS_ISILON_SDK:
         conn = isi_sdk.Configuration()
         if module_params['port_no'] is not None:
@@ -129,12 +176,42 @@ def get_isilon_connection(module_params):
         else:
             conn.host = module_params['onefs_host']
         conn.verify_ssl = module_params['verify_ssl']
+        if not conn.verify_ssl:
+            disable_insecure_request_warnings()
         conn.username = module_params['api_user']
         conn.password = module_params['api_password']
+        conn.connection_pool_maxsize = pool_maxsize
         api_client = isi_sdk.ApiClient(conn)
+        # The pools of the pool manager are created on the first request,
+        # so they all pick up the retry policy
+        api_client.rest_client.pool_manager.connection_pool_kw[
+            'retries'] = CONNECTION_RETRIES
+        api_client.set_default_header('Connection', 'keep-alive')
+        # urllib3 transparently decodes gzip encoded responses
+        api_client.set_default_header('Accept-Encoding', 'gzip')
         return api_client
 
 
+'''
+Determine the error message to return for an error raised by the SDK. The
+quotes and whitespace runs of the body of an ApiException are collapsed
+into single spaces, other errors are returned as they are.
+'''
+
+
+def determine_error(error_obj):
+    if HAS_ISILON_SDK and isinstance(error_obj, ApiException):
+        return ' '.join(str(error_obj.body).replace('"', ' ').split())
+    return str(error_obj)
+
+
+'''
+Format of the log messages. The root logger is configured with it by the
+first get_logger call only, later calls just return their logger.
+'''
+LOG_FORMAT = '%(asctime)-15s %(filename)s %(levelname)s : %(message)s'
+LOGGING_CONFIGURED = False
+
 '''
 This method is to initialize logger and return the logger object 
 parameters:
@@ -147,8 +224,10 @@ returns logger object
 
 def get_logger(module_name, log_file_name='dellemc_ansible_provisioning.log',
                log_devel=logging.INFO):
-    FORMAT = '%(asctime)-15s %(filename)s %(levelname)s : %(message)s'
-    logging.basicConfig(filename=log_file_name, format=FORMAT)
+    global LOGGING_CONFIGURED
+    if not LOGGING_CONFIGURED:
+        logging.basicConfig(filename=log_file_name, format=LOG_FORMAT)
+        LOGGING_CONFIGURED = True
     LOG = logging.getLogger(module_name)
     LOG.setLevel(log_devel)
     return LOG
@@ -161,20 +240,15 @@ KB_IN_BYTES = 1024
 MB_IN_BYTES = 1024 * 1024
 GB_IN_BYTES = 1024 * 1024 * 1024
 TB_IN_BYTES = 1024 * 1024 * 1024 * 1024
+UNIT_IN_BYTES = {'kb': KB_IN_BYTES, 'mb': MB_IN_BYTES, 'gb': GB_IN_BYTES,
+                 'tb': TB_IN_BYTES}
 
 
 def get_size_bytes(size, cap_units):
     if size is not None and size > 0:
-        if cap_units in ('kb', 'KB'):
-            return size * KB_IN_BYTES
-        elif cap_units in ('mb', 'MB'):
-            return size * MB_IN_BYTES
-        elif cap_units in ('gb', 'GB'):
-            return size * GB_IN_BYTES
-        elif cap_units in ('tb', 'TB'):
-            return size * TB_IN_BYTES
-        else:
-            return size
+        if cap_units:
+            return size * UNIT_IN_BYTES.get(cap_units.lower(), 1)
+        return size
     else:
         return 0
 
@@ -190,8 +264,9 @@ def convert_size_with_unit(size_bytes):
     if size_bytes == 0:
         return "0B"
     size_name = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
-    i = int(math.floor(math.log(size_bytes, 1024)))
-    p = math.pow(1024, i)
+    # Each unit is 2 ** 10 times the previous one
+    i = min((abs(size_bytes).bit_length() - 1) // 10, len(size_name) - 1)
+    p = float(1 << (10 * i))
     s = round(size_bytes / p, 2)
     return "%s %s" % (s, size_name[i])
 
@@ -203,7 +278,6 @@ Convert the given size to size in GB, size is restricted to 2 decimal places
 
 def get_size_in_gb(size, cap_units):
     size_in_bytes = get_size_bytes(size, cap_units)
-    size = Decimal(size_in_bytes / GB_IN_BYTES)
-    size_in_gb = round(size, 2)
+    size_in_gb = round(size_in_bytes / float(GB_IN_BYTES), 2)
     return size_in_gb
 